@@ -1,7 +1,42 @@
 from __future__ import annotations
 
+import os
 import time
+from functools import lru_cache
 from pathlib import Path
+from typing import Set, Tuple
+
+_DEFAULT_BASE = Path(__file__).resolve().parent
+
+# 本进程内已确认存在的目录，避免每次保存都 mkdir
+_created_dirs: Set[str] = set()
+# 时间戳按秒缓存（同一秒内多次保存复用同一字节串）
+_ts_sec = -1
+_ts_bytes = b""
+
+
+def _timestamp_bytes() -> bytes:
+    global _ts_sec, _ts_bytes
+    now = int(time.time())
+    if now != _ts_sec:
+        _ts_bytes = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now)).encode()
+        _ts_sec = now
+    return _ts_bytes
+
+
+@lru_cache(maxsize=128)
+def _adjustment_path(base: Path, basename: str) -> Tuple[Path, str]:
+    save_dir = base / "adjustments"
+    adj_file = save_dir / f"{basename}_adj.txt"
+    return adj_file, str(adj_file)
+
+
+def _ensure_dir(path: Path) -> None:
+    key = str(path)
+    if key in _created_dirs:
+        return
+    path.mkdir(exist_ok=True)
+    _created_dirs.add(key)
 
 
 def save_adjustment(basename: str, value: float, base_dir: Path | None = None) -> Path:
@@ -10,11 +45,19 @@ def save_adjustment(basename: str, value: float, base_dir: Path | None = None) -
     文件名格式：<basename>_adj.txt
     每次写入会覆盖旧内容（如需累计可调整为追加）。
     """
-    base = base_dir or Path(__file__).resolve().parent
-    save_dir = base / "adjustments"
-    save_dir.mkdir(exist_ok=True)
-    adj_file = save_dir / f"{basename}_adj.txt"
-    with open(adj_file, "w", encoding="utf-8") as f:
-        f.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')}\t{value:.2f}\n")
+    adj_file, adj_str = _adjustment_path(base_dir or _DEFAULT_BASE, basename)
+    _ensure_dir(adj_file.parent)
+    buf = b"%s\t%.2f\n" % (_timestamp_bytes(), value)
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+    try:
+        fd = os.open(adj_str, flags, 0o644)
+    except FileNotFoundError:
+        # 目录在运行期间被删除：作废缓存，重建目录后重试一次
+        _created_dirs.discard(str(adj_file.parent))
+        _ensure_dir(adj_file.parent)
+        fd = os.open(adj_str, flags, 0o644)
+    try:
+        os.write(fd, buf)
+    finally:
+        os.close(fd)
     return adj_file
-
@@ -0,0 +1,27 @@
+"""摄像头采集后端的选择与打开，供主界面、录制器和调试工具共用。"""
+import sys
+from typing import Optional
+
+try:
+    import cv2  # pip install opencv-python
+except Exception:  # pragma: no cover
+    cv2 = None
+
+# 按平台选定采集后端，避免在非 Windows 平台上先尝试必然失败的 DirectShow
+CAP_BACKEND: Optional[int] = None
+if cv2 is not None:
+    if sys.platform == "win32":
+        CAP_BACKEND = cv2.CAP_DSHOW
+    elif sys.platform == "darwin":
+        CAP_BACKEND = cv2.CAP_AVFOUNDATION
+    else:
+        CAP_BACKEND = cv2.CAP_V4L2
+
+
+def open_capture(index: int) -> "cv2.VideoCapture":
+    """用平台后端打开摄像头，失败时不指定后端再试一次；调用方需自行检查 isOpened()。"""
+    cap = cv2.VideoCapture(index, CAP_BACKEND)
+    if not cap.isOpened():
+        cap.release()
+        cap = cv2.VideoCapture(index)
+    return cap
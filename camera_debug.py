@@ -1,16 +1,54 @@
 from __future__ import annotations
 
+import functools
 import json
+import os
+import pickle
+import queue
+import threading
 import time
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Any, Callable, Dict, Optional, Tuple
 import tkinter as tk
 
 import cv2
+import numpy as np
 
+from camera_backend import open_capture
 
-@dataclass
+try:
+    import orjson  # pip install orjson（可选，加速 JSON 解析）
+except Exception:  # pragma: no cover
+    orjson = None
+
+
+# 像素格式滑块对应的 FOURCC；MJPG 由相机压缩传输，USB 带宽占用远小于 YUY2
+_FOURCC_OPTIONS = ("MJPG", "YUY2")
+
+# 相机打开失败后，滑块未变时的重试间隔（秒）
+_OPEN_RETRY_S = 1.0
+
+# 参数档案保存目录；与 main.py 一样在导入时解析一次
+_PROFILE_DIR = Path(__file__).resolve().parent / "camera_profiles"
+
+
+def _fourcc_str(value: float) -> str:
+    code = int(value)
+    return "".join(chr((code >> (8 * i)) & 0xFF) for i in range(4))
+
+
+# Tk 控制面板事件泵的最小间隔（面板只有两个按钮，30 Hz 足够）
+TK_PUMP_INTERVAL_S = 1 / 30
+
+# 解析结果缓存文件（<profile>.json.pkl）头部版本标记；CamParams 字段变化时需同步修改
+_PROFILE_CACHE_TAG = b"CAMPRM01"
+
+# 预先构造编码器，避免每次 json.dumps 重新解析参数
+_ENC = json.JSONEncoder(ensure_ascii=False, indent=2).encode
+
+
+@dataclass(frozen=True)
 class CamParams:
     camera_index: int = 0
     width: int = 1280
@@ -29,14 +67,40 @@ class CamParams:
     wb_temperature: int = 4500  # 2000..8000
 
     def to_json(self) -> str:
-        d: Dict = asdict(self)
-        # tuple -> list for JSON
-        d["roi"] = list(self.roi)
-        return json.dumps(d, ensure_ascii=False, indent=2)
+        return _encode(self)
+
+    def to_bytes(self) -> bytes:
+        """UTF-8 编码的 JSON，可直接 write_bytes。"""
+        return _encode_bytes(self)
 
     @staticmethod
     def from_json_file(path: Path) -> "CamParams":
-        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        """读取参数文件；旁路缓存（.json.pkl）比 JSON 新时直接加载缓存。"""
+        path = Path(path)
+        cache = path.with_name(path.name + ".pkl")
+        try:
+            if os.stat(cache).st_mtime_ns > os.stat(path).st_mtime_ns:
+                blob = cache.read_bytes()
+                if blob[:8] == _PROFILE_CACHE_TAG:
+                    return pickle.loads(blob[8:])
+        except Exception:
+            # 缓存缺失或损坏时回落到解析 JSON
+            pass
+
+        params = CamParams._parse_json_file(path)
+        try:
+            tmp = cache.with_name(cache.name + ".tmp")
+            tmp.write_bytes(_PROFILE_CACHE_TAG + pickle.dumps(params, protocol=5))
+            os.replace(tmp, cache)
+        except OSError:
+            pass
+        return params
+
+    @staticmethod
+    def _parse_json_file(path: Path) -> "CamParams":
+        raw = Path(path).read_bytes()
+        # 直接解析 UTF-8 字节，省去 read_text 的解码步骤
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
         return CamParams(
             camera_index=int(data.get("camera_index", 0)),
             width=int(data.get("width", 1280)),
@@ -54,17 +118,260 @@ class CamParams:
             wb_temperature=int(data.get("wb_temperature", 4500)),
         )
 
+def _as_json_dict(cp: CamParams) -> Dict:
+    # 扁平结构直接构造，省去 asdict 的递归深拷贝；键顺序与字段定义一致
+    return {
+        "camera_index": cp.camera_index,
+        "width": cp.width,
+        "height": cp.height,
+        "fps": cp.fps,
+        "roi": list(cp.roi),  # tuple -> list for JSON
+        "auto_exposure": cp.auto_exposure,
+        "exposure_1by10": cp.exposure_1by10,
+        "gain": cp.gain,
+        "brightness": cp.brightness,
+        "contrast": cp.contrast,
+        "saturation": cp.saturation,
+        "gamma": cp.gamma,
+        "auto_wb": cp.auto_wb,
+        "wb_temperature": cp.wb_temperature,
+    }
+
+
+@functools.lru_cache(maxsize=32)
+def _encode(cp: CamParams) -> str:
+    """CamParams 不可变且可哈希，相同参数重复保存时直接复用编码结果。"""
+    return _ENC(_as_json_dict(cp))
+
+
+@functools.lru_cache(maxsize=32)
+def _encode_bytes(cp: CamParams) -> bytes:
+    d = _as_json_dict(cp)
+    if orjson is not None:
+        # 一次 C 调用直接得到 UTF-8 字节，输出格式与 _ENC 相同
+        return orjson.dumps(d, option=orjson.OPT_INDENT_2)
+    return _ENC(d).encode("utf-8")
+
+
+def _placeholder_frame(msg: str) -> np.ndarray:
+    frame = np.zeros((360, 640, 3), dtype=np.uint8)
+    cv2.putText(frame, msg, (30, 180), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 2)
+    return frame
+
+
+# 占位图只读（imshow 不会修改），预先渲染后复用
+_READ_FAIL_FRAME = _placeholder_frame("读取失败")
+
+
+@functools.lru_cache(maxsize=16)
+def _no_cam_frame(idx: int) -> np.ndarray:
+    return _placeholder_frame(f"Cam {idx} 未打开")
+
+
+@functools.lru_cache(maxsize=8)
+def _hud_tile(text: str) -> Tuple[np.ndarray, np.ndarray]:
+    """将 HUD 文字渲染到黑底小图块并缓存，返回 (图块, 1 - 覆盖率)，均为 float32。"""
+    (text_w, _), _ = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 0.8, 2)
+    tile = np.zeros((36, 10 + text_w + 4, 3), dtype=np.uint8)
+    cv2.putText(tile, text, (10, 28), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 0), 2)
+    # 黑底上文字颜色的 B 通道为 255，其值即该像素的覆盖率（新版 OpenCV 的 putText 会对边缘做抗锯齿）
+    inv_alpha = 1.0 - tile[:, :, :1].astype(np.float32) / 255.0
+    # 预先加 0.5，混合后截断即为四舍五入
+    return tile.astype(np.float32) + 0.5, inv_alpha
+
+
+def _blit_hud(frame: np.ndarray, text: str) -> None:
+    """按覆盖率把缓存的文字混合到画面左上角，结果与直接 putText 一致（含抗锯齿边缘）。"""
+    tile, inv_alpha = _hud_tile(text)
+    h = min(tile.shape[0], frame.shape[0])
+    w = min(tile.shape[1], frame.shape[1])
+    # ROI 预览画面可能比 HUD 小，按画面尺寸裁剪；roi 为视图，原地写入
+    roi = frame[:h, :w]
+    roi[:] = np.minimum(roi * inv_alpha[:h, :w] + tile[:h, :w], 255.0)
+
+
+def _apply_if_changed(cap: cv2.VideoCapture, applied: Dict[int, float], prop: int, value: float, tol: float = 0.0) -> None:
+    """仅当属性值与上次下发的不同才调用 cap.set，并更新缓存。"""
+    last = applied.get(prop)
+    if last is not None and abs(last - value) <= tol:
+        return
+    cap.set(prop, value)
+    applied[prop] = value
+
+
+# 回填滑块时需要读取的相机属性
+_SYNC_PROPS = (
+    cv2.CAP_PROP_FRAME_WIDTH,
+    cv2.CAP_PROP_FRAME_HEIGHT,
+    cv2.CAP_PROP_FPS,
+    cv2.CAP_PROP_AUTO_EXPOSURE,
+    cv2.CAP_PROP_EXPOSURE,
+    cv2.CAP_PROP_GAIN,
+    cv2.CAP_PROP_BRIGHTNESS,
+    cv2.CAP_PROP_CONTRAST,
+    cv2.CAP_PROP_SATURATION,
+    cv2.CAP_PROP_GAMMA,
+    cv2.CAP_PROP_AUTO_WB,
+    cv2.CAP_PROP_WB_TEMPERATURE,
+)
+
+
+def _read_cap_props(cap: Optional[cv2.VideoCapture], props: Tuple[int, ...]) -> Optional[Dict[int, float]]:
+    """一次遍历读取多个相机属性；cap 为 None 时返回 None。"""
+    if cap is None:
+        return None
+    return {prop: cap.get(prop) for prop in props}
+
+
+def _snapshot_trackbars(win: str) -> Tuple[CamParams, Dict]:
+    """一次性读取所有滑块，返回 CamParams 及不属于参数文件的附加项。"""
+    pos = cv2.getTrackbarPos
+    params = CamParams(
+        camera_index=pos("CamIndex", win),
+        width=pos("Width", win),
+        height=pos("Height", win),
+        fps=pos("FPS", win),
+        roi=(pos("ROI_X", win), pos("ROI_Y", win), pos("ROI_W", win), pos("ROI_H", win)),
+        auto_exposure=pos("AutoExp(0/1)", win),
+        exposure_1by10=pos("Exposure(-13..0) x10", win),
+        gain=pos("Gain", win),
+        brightness=pos("Brightness", win),
+        contrast=pos("Contrast", win),
+        saturation=pos("Saturation", win),
+        gamma=pos("Gamma x100", win),
+        auto_wb=pos("AutoWB(0/1)", win),
+        wb_temperature=pos("WB_Temp", win),
+    )
+    extras = {
+        "preview_roi": pos("PreviewROI(0/1)", win) == 1,
+        "fourcc": _FOURCC_OPTIONS[pos("FOURCC(0=MJPG,1=YUY2)", win)],
+    }
+    return params, extras
+
+
+class CaptureThread(threading.Thread):
+    """
+    后台采集线程：
+    - 独占 VideoCapture，循环 read()，单槽队列只保留最新一帧（旧帧直接丢弃）。
+    - 其他线程对相机的打开/属性读写通过 call()/post() 投递过来，在两次 read 之间串行执行。
+    """
+
+    def __init__(self) -> None:
+        super().__init__(daemon=True)
+        # 仅在打开成功时非 None，主线程可直接读取判断是否已打开
+        self.cap: Optional[cv2.VideoCapture] = None
+        self.frames: "queue.Queue[Tuple[bool, Any]]" = queue.Queue(maxsize=1)
+        self._commands: "queue.Queue[Tuple[Callable, tuple, Optional[threading.Event], Optional[Dict]]]" = queue.Queue()
+        self._stop_event = threading.Event()
+
+    # ---------------------- 命令投递 ---------------------- #
+    def call(self, fn: Callable, *args):
+        """在采集线程上执行 fn(*args)，阻塞等待并返回结果。"""
+        done = threading.Event()
+        box: Dict[str, Any] = {}
+        self._commands.put((fn, args, done, box))
+        done.wait()
+        if "error" in box:
+            raise box["error"]
+        return box.get("result")
+
+    def post(self, fn: Callable, *args) -> None:
+        """投递到采集线程执行，不等待结果。"""
+        self._commands.put((fn, args, None, None))
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join(timeout=1.0)
+
+    # ---------------------- 以下方法只在采集线程内调用 ---------------------- #
+    def open(self, idx: int, fourcc: Optional[str] = None) -> bool:
+        self.release()
+        cap = open_capture(idx)
+        if not cap.isOpened():
+            cap.release()
+            return False
+        if fourcc:
+            # 须在设置分辨率/FPS 之前指定像素格式
+            cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+            actual = _fourcc_str(cap.get(cv2.CAP_PROP_FOURCC))
+            if actual != fourcc:
+                print(f"Cam {idx}: FOURCC {fourcc} 未生效，当前为 {actual!r}")
+        # 驱动只保留最新一帧，避免界面卡顿时读到积压的旧帧（部分后端不支持）
+        try:
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        except Exception:
+            pass
+        self.cap = cap
+        return True
+
+    def release(self) -> None:
+        cap, self.cap = self.cap, None
+        if cap is not None:
+            try:
+                cap.release()
+            except Exception:
+                pass
+        # 丢弃旧句柄留下的帧
+        try:
+            self.frames.get_nowait()
+        except queue.Empty:
+            pass
+
+    def run(self) -> None:
+        while not self._stop_event.is_set():
+            # 未打开相机时阻塞等待命令，避免空转
+            self._run_commands(timeout=0.05 if self.cap is None else 0.0)
+            cap = self.cap
+            if cap is None:
+                continue
+            ok, frame = cap.read()
+            self._publish((bool(ok) and frame is not None, frame))
+        self.release()
+
+    def _run_commands(self, timeout: float) -> None:
+        try:
+            item = self._commands.get(timeout=timeout) if timeout else self._commands.get_nowait()
+        except queue.Empty:
+            return
+        while True:
+            fn, args, done, box = item
+            try:
+                result = fn(*args)
+                if box is not None:
+                    box["result"] = result
+            except Exception as exc:
+                if box is not None:
+                    box["error"] = exc
+            finally:
+                if done is not None:
+                    done.set()
+            try:
+                item = self._commands.get_nowait()
+            except queue.Empty:
+                return
 
-def clamp(v: int, lo: int, hi: int) -> int:
-    return max(lo, min(hi, v))
+    def _publish(self, item: Tuple[bool, Any]) -> None:
+        # 单生产者：先丢弃未被取走的旧帧，再放入最新帧
+        try:
+            self.frames.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            self.frames.put_nowait(item)
+        except queue.Full:
+            pass
 
 
 def main() -> None:
-    profile_dir = Path(__file__).resolve().parent / "camera_profiles"
-    profile_dir.mkdir(exist_ok=True)
+    _PROFILE_DIR.mkdir(exist_ok=True)
 
     win = "Camera Debug"
     cv2.namedWindow(win, cv2.WINDOW_NORMAL)
+    # 关闭垂直同步，避免显示刷新率限制预览帧率（旧版本 OpenCV 无此属性）
+    try:
+        cv2.setWindowProperty(win, cv2.WND_PROP_VSYNC, 0)
+    except Exception:
+        pass
     # 创建独立的 Tk 控制面板（实体按钮，不在视频画面内渲染）
     root = tk.Tk()
     root.title("相机调试控制")
@@ -81,6 +388,7 @@ def main() -> None:
     cv2.createTrackbar("ROI_W", win, 0, 3840, lambda v: None)
     cv2.createTrackbar("ROI_H", win, 0, 2160, lambda v: None)
     cv2.createTrackbar("PreviewROI(0/1)", win, 0, 1, lambda v: None)
+    cv2.createTrackbar("FOURCC(0=MJPG,1=YUY2)", win, 0, 1, lambda v: None)
 
     # 高速拍摄相关参数
     cv2.createTrackbar("AutoExp(0/1)", win, 1, 1, lambda v: None)
@@ -94,7 +402,15 @@ def main() -> None:
     cv2.createTrackbar("WB_Temp", win, 4500, 8000, lambda v: None)
 
     last_open_params = CamParams()
-    cap: cv2.VideoCapture | None = None
+    # 当前相机句柄打开时请求的像素格式
+    opened_fourcc: str | None = None
+    # 打开失败后的下次重试时间（monotonic）
+    open_retry_at = 0.0
+    # 相机句柄由采集线程独占，主线程只通过 grabber.call/post 访问
+    grabber = CaptureThread()
+    grabber.start()
+    # 已下发到当前相机句柄的属性值（重开/恢复默认后清空）；只在采集线程内读写
+    applied: Dict[int, float] = {}
     reset_requested = False
     exit_requested = False
 
@@ -112,28 +428,37 @@ def main() -> None:
     btn_exit.pack(pady=4, fill=tk.X, padx=10)
     root.protocol("WM_DELETE_WINDOW", on_exit)
 
+    def set_cap_props(props: Dict[int, float]) -> None:
+        """（采集线程）批量设置相机属性。"""
+        cap = grabber.cap
+        if cap is None:
+            return
+        for prop, value in props.items():
+            cap.set(prop, value)
+
     def sync_trackbars_from_cap() -> None:
         """读取相机当前参数，回填到 Trackbar，使默认即为设备当前值。"""
-        nonlocal cap, last_open_params
-        if cap is None or not cap.isOpened():
+        nonlocal last_open_params
+        props = grabber.call(_read_cap_props, grabber.cap, _SYNC_PROPS)
+        if props is None:
             return
-        cur_w = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH) or 0)
-        cur_h = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT) or 0)
-        cur_fps = int(cap.get(cv2.CAP_PROP_FPS) or 30)
+        cur_w = int(props[cv2.CAP_PROP_FRAME_WIDTH] or 0)
+        cur_h = int(props[cv2.CAP_PROP_FRAME_HEIGHT] or 0)
+        cur_fps = int(props[cv2.CAP_PROP_FPS] or 30)
         cv2.setTrackbarPos("Width", win, max(0, cur_w))
         cv2.setTrackbarPos("Height", win, max(0, cur_h))
         cv2.setTrackbarPos("FPS", win, max(0, min(cur_fps, 240)))
 
         # 读取曝光/增益等（不同相机返回范围不一）
-        auto_exp = int(cap.get(cv2.CAP_PROP_AUTO_EXPOSURE) or 1)
+        auto_exp = int(props[cv2.CAP_PROP_AUTO_EXPOSURE] or 1)
         cv2.setTrackbarPos("AutoExp(0/1)", win, 1 if auto_exp in (1, 0.75) else 0)
-        exp_val = cap.get(cv2.CAP_PROP_EXPOSURE)
+        exp_val = props[cv2.CAP_PROP_EXPOSURE]
         if exp_val is not None and exp_val == exp_val:
             # 将 [-13..0] 转成 x10 的 [0..130] 反向
             val = int(round((-float(exp_val)) * 10.0))
             val = max(0, min(130, val))
             cv2.setTrackbarPos("Exposure(-13..0) x10", win, val)
-        gain = int(cap.get(cv2.CAP_PROP_GAIN) or 0)
+        gain = int(props[cv2.CAP_PROP_GAIN] or 0)
         cv2.setTrackbarPos("Gain", win, max(0, min(255, gain)))
         for name, prop in (
             ("Brightness", cv2.CAP_PROP_BRIGHTNESS),
@@ -141,53 +466,30 @@ def main() -> None:
             ("Saturation", cv2.CAP_PROP_SATURATION),
             ("Gamma x100", cv2.CAP_PROP_GAMMA),
         ):
-            v = int(cap.get(prop) or 0)
+            v = int(props[prop] or 0)
             v = max(0, min(500, v))
             cv2.setTrackbarPos(name, win, v)
-        awb = int(cap.get(cv2.CAP_PROP_AUTO_WB) or 1)
+        awb = int(props[cv2.CAP_PROP_AUTO_WB] or 1)
         cv2.setTrackbarPos("AutoWB(0/1)", win, 1 if awb else 0)
-        wb = int(cap.get(cv2.CAP_PROP_WB_TEMPERATURE) or 4500)
+        wb = int(props[cv2.CAP_PROP_WB_TEMPERATURE] or 4500)
         cv2.setTrackbarPos("WB_Temp", win, max(2000, min(8000, wb)))
 
-        last_open_params = CamParams(
+        snap, _ = _snapshot_trackbars(win)
+        last_open_params = replace(
+            snap,
             camera_index=last_open_params.camera_index,
             width=cur_w,
             height=cur_h,
             fps=cur_fps,
-            roi=(cv2.getTrackbarPos("ROI_X", win), cv2.getTrackbarPos("ROI_Y", win),
-                 cv2.getTrackbarPos("ROI_W", win), cv2.getTrackbarPos("ROI_H", win)),
-            auto_exposure=cv2.getTrackbarPos("AutoExp(0/1)", win),
-            exposure_1by10=cv2.getTrackbarPos("Exposure(-13..0) x10", win),
-            gain=cv2.getTrackbarPos("Gain", win),
-            brightness=cv2.getTrackbarPos("Brightness", win),
-            contrast=cv2.getTrackbarPos("Contrast", win),
-            saturation=cv2.getTrackbarPos("Saturation", win),
-            gamma=cv2.getTrackbarPos("Gamma x100", win),
-            auto_wb=cv2.getTrackbarPos("AutoWB(0/1)", win),
-            wb_temperature=cv2.getTrackbarPos("WB_Temp", win),
         )
 
-    def reset_to_device_defaults() -> None:
-        """尽力恢复到设备出厂/驱动默认：
-        - 关闭并重新打开相机句柄
-        - 置为自动曝光/自动白平衡
-        - 将可调属性设为 -1（若驱动支持则回落到默认）
-        - 不强行设置分辨率/FPS，读取实际值回填
-        """
-        nonlocal cap, last_open_params
-        idx = last_open_params.camera_index
+    def reset_device(idx: int, fourcc: str | None) -> bool:
+        """（采集线程）重新打开相机并将可调属性恢复为自动/默认。"""
+        applied.clear()
         # 关闭并重新打开
-        try:
-            if cap is not None:
-                cap.release()
-        except Exception:
-            pass
-        cap = cv2.VideoCapture(idx, cv2.CAP_DSHOW)
-        if not cap.isOpened():
-            cap.release()
-            cap = cv2.VideoCapture(idx)
-        if not cap.isOpened():
-            return
+        if not grabber.open(idx, fourcc):
+            return False
+        cap = grabber.cap
 
         # 设为自动模式（不同后端取值差异较大，这里做兼容写法）
         try:
@@ -214,184 +516,218 @@ def main() -> None:
                 cap.set(prop, -1)
             except Exception:
                 pass
+        return True
+
+    def reset_to_device_defaults() -> None:
+        """尽力恢复到设备出厂/驱动默认：
+        - 关闭并重新打开相机句柄
+        - 置为自动曝光/自动白平衡
+        - 将可调属性设为 -1（若驱动支持则回落到默认）
+        - 不强行设置分辨率/FPS，读取实际值回填
+        """
+        if not grabber.call(reset_device, last_open_params.camera_index, opened_fourcc):
+            return
 
         # 稍等让驱动应用
         cv2.waitKey(30)
         # 回填实际值到滑块
         sync_trackbars_from_cap()
 
-    def reopen_if_needed() -> None:
-        nonlocal cap, last_open_params
-        idx = cv2.getTrackbarPos("CamIndex", win)
-        width = cv2.getTrackbarPos("Width", win)
-        height = cv2.getTrackbarPos("Height", win)
-        fps = cv2.getTrackbarPos("FPS", win)
-
-        need_open = (
-            cap is None
-            or int(last_open_params.camera_index) != int(idx)
+    def open_device(idx: int, fourcc: str) -> bool:
+        """（采集线程）打开指定相机，并清空已下发属性缓存。"""
+        applied.clear()
+        return grabber.open(idx, fourcc)
+
+    def reopen_if_needed(snap: CamParams, extras: Dict) -> bool:
+        """按滑块快照判断是否需要重新打开相机；重新打开后返回 True。"""
+        nonlocal last_open_params, opened_fourcc, open_retry_at
+        idx = snap.camera_index
+        width = snap.width
+        height = snap.height
+        fps = snap.fps
+
+        params_changed = (
+            int(last_open_params.camera_index) != int(idx)
             or (width and int(last_open_params.width) != int(width))
             or (height and int(last_open_params.height) != int(height))
             or (fps and int(last_open_params.fps) != int(fps))
+            or extras["fourcc"] != opened_fourcc
         )
+        # 滑块未变时，打开失败的相机最多每 _OPEN_RETRY_S 秒重试一次，避免每轮循环都去打开
+        need_open = params_changed or (grabber.cap is None and time.monotonic() >= open_retry_at)
         if not need_open:
-            return
-
-        if cap is not None:
-            cap.release()
-            cap = None
+            return False
 
-        cap = cv2.VideoCapture(idx, cv2.CAP_DSHOW)
-        if not cap.isOpened():
-            # retry without backend
-            cap.release()
-            cap = cv2.VideoCapture(idx)
-        if not cap.isOpened():
+        opened_fourcc = extras["fourcc"]
+        if not grabber.call(open_device, idx, opened_fourcc):
             last_open_params = CamParams(camera_index=idx, width=width or 0, height=height or 0, fps=fps or 0)
-            return
+            open_retry_at = time.monotonic() + _OPEN_RETRY_S
+            return True
 
-        # 首次为该相机打开时，不强制设置分辨率/FPS，先读取设备当前并回填到滑块
+        # 首次为该相机打开时，不强制设置分辨率/FPS，以设备当前值为准（FPS 受滑块上限约束）
         last_open_params = CamParams(camera_index=idx, width=0, height=0, fps=0)
-        sync_trackbars_from_cap()
-
-        # 如果滑块中有明确值（非 0），再按需设置到相机
-        width = cv2.getTrackbarPos("Width", win)
-        height = cv2.getTrackbarPos("Height", win)
-        fps = cv2.getTrackbarPos("FPS", win)
+        cur = grabber.call(
+            _read_cap_props,
+            grabber.cap,
+            (cv2.CAP_PROP_FRAME_WIDTH, cv2.CAP_PROP_FRAME_HEIGHT, cv2.CAP_PROP_FPS),
+        )
+        width = max(0, int(cur[cv2.CAP_PROP_FRAME_WIDTH] or 0))
+        height = max(0, int(cur[cv2.CAP_PROP_FRAME_HEIGHT] or 0))
+        fps = max(0, min(int(cur[cv2.CAP_PROP_FPS] or 30), 240))
+        props: Dict[int, float] = {}
         if width:
-            cap.set(cv2.CAP_PROP_FRAME_WIDTH, float(width))
+            props[cv2.CAP_PROP_FRAME_WIDTH] = float(width)
         if height:
-            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, float(height))
+            props[cv2.CAP_PROP_FRAME_HEIGHT] = float(height)
         if fps:
-            cap.set(cv2.CAP_PROP_FPS, float(fps))
-        # 再次同步（以相机可能的实际支持值为准）
+            props[cv2.CAP_PROP_FPS] = float(fps)
+        grabber.call(set_cap_props, props)
+        # 设置完成后只回填一次（以相机可能的实际支持值为准）
         sync_trackbars_from_cap()
+        return True
 
-    last_ts = time.time()
-    frame_count = 0
+    def apply_controls(snap: CamParams) -> None:
+        """（采集线程）将曝光/增益等参数应用到相机。"""
+        cap = grabber.cap
+        if cap is None:
+            return
+        auto_exp = snap.auto_exposure
+        # 兼容设定（不同后端取值范围不同）；两次写入只在开关变化时执行
+        if applied.get(cv2.CAP_PROP_AUTO_EXPOSURE) != auto_exp:
+            try:
+                cap.set(cv2.CAP_PROP_AUTO_EXPOSURE, 1 if auto_exp == 1 else 0)
+                cap.set(cv2.CAP_PROP_AUTO_EXPOSURE, 0.75 if auto_exp == 1 else 0.25)
+            except Exception:
+                pass
+            applied[cv2.CAP_PROP_AUTO_EXPOSURE] = auto_exp
+        exp_val = -float(snap.exposure_1by10) / 10.0
+        _apply_if_changed(cap, applied, cv2.CAP_PROP_EXPOSURE, exp_val)
+        _apply_if_changed(cap, applied, cv2.CAP_PROP_GAIN, float(snap.gain))
+        _apply_if_changed(cap, applied, cv2.CAP_PROP_BRIGHTNESS, float(snap.brightness))
+        _apply_if_changed(cap, applied, cv2.CAP_PROP_CONTRAST, float(snap.contrast))
+        _apply_if_changed(cap, applied, cv2.CAP_PROP_SATURATION, float(snap.saturation))
+        _apply_if_changed(cap, applied, cv2.CAP_PROP_GAMMA, float(snap.gamma))
+        auto_wb = snap.auto_wb
+        _apply_if_changed(cap, applied, cv2.CAP_PROP_AUTO_WB, 1.0 if auto_wb == 1 else 0.0)
+        if auto_wb == 0:
+            _apply_if_changed(cap, applied, cv2.CAP_PROP_WB_TEMPERATURE, float(snap.wb_temperature))
+
+    # FPS：每帧用单调时钟做指数滑动平均；显示值每 0.5 s 刷新一次，避免 HUD 缓存频繁失效
+    t_prev_ns = time.perf_counter_ns()
+    ewma_fps = 0.0
     shown_fps = 0.0
+    shown_ts_ns = t_prev_ns
+    # 上一次已下发到相机的滑块快照；未变化时跳过全部 cap.set
+    applied_snap: CamParams | None = None
+    # ROI 钳制结果只随滑块/分辨率变化，缓存 (roi, w, h) -> (x, y, rw, rh)
+    roi_key = None
+    roi_rect = (0, 0, 0, 0)
+    last_tk = 0.0
 
     while True:
-        reopen_if_needed()
-        if cap is None or not cap.isOpened():
-            # 直接创建一张纯色图像（不再在视频画面内绘制按钮）
-            import numpy as np
-            frame = np.zeros((360, 640, 3), dtype=np.uint8)
-            msg = f"Cam {last_open_params.camera_index} 未打开"
-            cv2.putText(frame, msg, (30, 180), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 2)
-            cv2.imshow(win, frame)
+        # 每帧只读取一次全部滑块
+        snap, extras = _snapshot_trackbars(win)
+        if reopen_if_needed(snap, extras):
+            applied_snap = None
+            snap, extras = _snapshot_trackbars(win)
+        if grabber.cap is None:
+            # 纯色占位图（不再在视频画面内绘制按钮）
+            cv2.imshow(win, _no_cam_frame(last_open_params.camera_index))
         else:
-            ok, frame = cap.read()
-            if not ok or frame is None:
+            # 等待采集线程的最新帧；超时则本轮不刷新画面，继续处理控件与事件
+            try:
+                ok, frame = grabber.frames.get(timeout=0.1)
+            except queue.Empty:
+                ok, frame = None, None
+            if ok is None:
+                pass
+            elif not ok:
                 # 显示占位图
-                import numpy as np
-                frame = np.zeros((360, 640, 3), dtype=np.uint8)
-                cv2.putText(frame, "读取失败", (30, 180), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 2)
-                cv2.imshow(win, frame)
+                cv2.imshow(win, _READ_FAIL_FRAME)
             else:
                 h, w = frame.shape[:2]
 
-                x = clamp(cv2.getTrackbarPos("ROI_X", win), 0, w - 1)
-                y = clamp(cv2.getTrackbarPos("ROI_Y", win), 0, h - 1)
-                rw = clamp(cv2.getTrackbarPos("ROI_W", win), 0, w - x)
-                rh = clamp(cv2.getTrackbarPos("ROI_H", win), 0, h - y)
-
-                show_roi = cv2.getTrackbarPos("PreviewROI(0/1)", win) == 1
+                if roi_key != (snap.roi, w, h):
+                    roi_x, roi_y, roi_w, roi_h = snap.roi
+                    x = max(0, min(w - 1, roi_x))
+                    y = max(0, min(h - 1, roi_y))
+                    rw = max(0, min(w - x, roi_w))
+                    rh = max(0, min(h - y, roi_h))
+                    roi_key = (snap.roi, w, h)
+                    roi_rect = (x, y, rw, rh)
+                x, y, rw, rh = roi_rect
+
+                show_roi = extras["preview_roi"]
                 if show_roi and rw > 0 and rh > 0:
-                    frame = frame[y : y + rh, x : x + rw]
+                    # 切片是非连续视图，显式拷贝一次，后续 putText/imshow 走连续内存路径
+                    frame = np.ascontiguousarray(frame[y : y + rh, x : x + rw])
                 else:
-                    # 在全图上绘制 ROI 边框
+                    # 在全图上绘制 ROI 边框（每帧都是新缓冲区，需要重新绘制）
                     if rw > 0 and rh > 0:
                         cv2.rectangle(frame, (x, y), (x + rw, y + rh), (0, 255, 0), 2)
 
                 # FPS 计算
-                frame_count += 1
-                now = time.time()
-                if now - last_ts >= 0.5:
-                    shown_fps = frame_count / (now - last_ts)
-                    last_ts = now
-                    frame_count = 0
+                t_ns = time.perf_counter_ns()
+                dt_ns = t_ns - t_prev_ns
+                t_prev_ns = t_ns
+                if dt_ns > 0:
+                    inst = 1e9 / dt_ns
+                    ewma_fps = inst if ewma_fps == 0.0 else 0.9 * ewma_fps + 0.1 * inst
+                if t_ns - shown_ts_ns >= 500_000_000:
+                    shown_fps = round(ewma_fps, 1)
+                    shown_ts_ns = t_ns
 
                 hud = f"Idx:{last_open_params.camera_index}  Res:{w}x{h}  TargetFPS:{last_open_params.fps}  PrevFPS:{shown_fps:.1f}"
-                cv2.putText(frame, hud, (10, 28), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 0), 2)
+                _blit_hud(frame, hud)
                 cv2.imshow(win, frame)
 
-        # 将曝光/增益等参数应用到相机
-        if cap is not None and cap.isOpened():
-            auto_exp = cv2.getTrackbarPos("AutoExp(0/1)", win)
-            # 兼容设定（不同后端取值范围不同）
+        # 将曝光/增益等参数投递到采集线程（滑块未变化时跳过）
+        if grabber.cap is not None and snap != applied_snap:
+            grabber.post(apply_controls, snap)
+            applied_snap = snap
+
+        # 驱动 Tk 控制窗口事件并处理“恢复默认/退出”（约 30 Hz 即可，不必每帧）
+        now_tk = time.monotonic()
+        if now_tk - last_tk >= TK_PUMP_INTERVAL_S:
+            last_tk = now_tk
             try:
-                cap.set(cv2.CAP_PROP_AUTO_EXPOSURE, 1 if auto_exp == 1 else 0)
-                cap.set(cv2.CAP_PROP_AUTO_EXPOSURE, 0.75 if auto_exp == 1 else 0.25)
+                root.update_idletasks(); root.update()
             except Exception:
-                pass
-            exp_1by10 = cv2.getTrackbarPos("Exposure(-13..0) x10", win)
-            exp_val = -float(exp_1by10) / 10.0
-            cap.set(cv2.CAP_PROP_EXPOSURE, exp_val)
-            cap.set(cv2.CAP_PROP_GAIN, float(cv2.getTrackbarPos("Gain", win)))
-            cap.set(cv2.CAP_PROP_BRIGHTNESS, float(cv2.getTrackbarPos("Brightness", win)))
-            cap.set(cv2.CAP_PROP_CONTRAST, float(cv2.getTrackbarPos("Contrast", win)))
-            cap.set(cv2.CAP_PROP_SATURATION, float(cv2.getTrackbarPos("Saturation", win)))
-            cap.set(cv2.CAP_PROP_GAMMA, float(cv2.getTrackbarPos("Gamma x100", win)))
-            auto_wb = cv2.getTrackbarPos("AutoWB(0/1)", win)
-            cap.set(cv2.CAP_PROP_AUTO_WB, 1 if auto_wb == 1 else 0)
-            if auto_wb == 0:
-                cap.set(cv2.CAP_PROP_WB_TEMPERATURE, float(cv2.getTrackbarPos("WB_Temp", win)))
-
-        # 驱动 Tk 控制窗口事件并处理“恢复默认/退出”
-        try:
-            root.update_idletasks(); root.update()
-        except Exception:
-            exit_requested = True
+                exit_requested = True
 
         if reset_requested:
             reset_requested = False
             reset_to_device_defaults()
+            applied_snap = None
+            snap, extras = _snapshot_trackbars(win)
         if exit_requested:
             break
 
-        key = cv2.waitKey(1) & 0xFF
+        # pollKey 不强制休眠，仍会处理窗口消息
+        key = cv2.pollKey() & 0xFF
         if key == ord('q'):
             break
         elif key == ord('s'):
             # 保存参数到 JSON
             idx = last_open_params.camera_index
-            width = last_open_params.width
-            height = last_open_params.height
-            fps = last_open_params.fps
-            x = cv2.getTrackbarPos("ROI_X", win)
-            y = cv2.getTrackbarPos("ROI_Y", win)
-            rw = cv2.getTrackbarPos("ROI_W", win)
-            rh = cv2.getTrackbarPos("ROI_H", win)
-            params = CamParams(
+            params = replace(
+                snap,
                 camera_index=idx,
-                width=width,
-                height=height,
-                fps=fps,
-                roi=(x, y, rw, rh),
-                auto_exposure=cv2.getTrackbarPos("AutoExp(0/1)", win),
-                exposure_1by10=cv2.getTrackbarPos("Exposure(-13..0) x10", win),
-                gain=cv2.getTrackbarPos("Gain", win),
-                brightness=cv2.getTrackbarPos("Brightness", win),
-                contrast=cv2.getTrackbarPos("Contrast", win),
-                saturation=cv2.getTrackbarPos("Saturation", win),
-                gamma=cv2.getTrackbarPos("Gamma x100", win),
-                auto_wb=cv2.getTrackbarPos("AutoWB(0/1)", win),
-                wb_temperature=cv2.getTrackbarPos("WB_Temp", win),
+                width=last_open_params.width,
+                height=last_open_params.height,
+                fps=last_open_params.fps,
             )
-            out = profile_dir / f"cam_{idx}_profile.json"
-            out.write_text(params.to_json(), encoding="utf-8")
+            out = _PROFILE_DIR / f"cam_{idx}_profile.json"
+            out.write_bytes(params.to_bytes())
             print(f"Saved profile → {out}")
 
-    if cap is not None:
-        cap.release()
+    grabber.stop()
     cv2.destroyAllWindows()
     try:
         root.destroy()
     except Exception:
         pass
 
-
 if __name__ == "__main__":
     main()
 
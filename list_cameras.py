@@ -1,13 +1,21 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import cv2
 
-def list_cameras():
-    available_cameras = []
-    for i in range(5):
-        cap = cv2.VideoCapture(i)
-        if cap.isOpened():
-            available_cameras.append(i)
-            cap.release()
-    return available_cameras
+from camera_backend import open_capture
+
+def _probe(i):
+    # 先用平台后端，打不开时退回默认后端，避免漏掉只有 CAP_ANY 能找到的设备
+    cap = open_capture(i)
+    ok = cap.isOpened()
+    cap.release()
+    return i if ok else None
+
+def list_cameras(max_index=5):
+    # 各索引的打开相互独立，并行探测，总耗时约等于最慢的一次
+    with ThreadPoolExecutor(max_workers=max_index) as ex:
+        results = list(ex.map(_probe, range(max_index)))
+    return [i for i in results if i is not None]
 
 cameras = list_cameras()
-print(f"Available cameras: {cameras}")
\ No newline at end of file
+print(f"Available cameras: {cameras}")
@@ -1,25 +1,74 @@
 
-import sys, time, threading
-import base64
+import os, sys, time, threading
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from functools import lru_cache
 from pathlib import Path
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
 import re
-from typing import Optional
+from typing import Optional, Set, Tuple
 from adjustment import save_adjustment
+from camera_backend import open_capture
 from video_recorder import OpenCVDualRecorder
 from weight_reader import WeightReader, WeightReaderConfig
 from mcu_control import MCUController
 try:
     import cv2
+    import numpy as np  # opencv-python 的依赖，随 cv2 一起可用
 except Exception:
     cv2 = None
+try:
+    from PIL import Image, ImageTk  # 可选：有 Pillow 时预览直接传像素，不经 PPM 文本解析
+except Exception:
+    Image = ImageTk = None
+
+# 项目目录只解析一次（resolve() 会触发文件系统查询）
+_MODULE_DIR = Path(__file__).resolve().parent
+_VIDEO_DIR = _MODULE_DIR / "videos"
+
+
+# 日志时间戳 (整秒, "HH:MM:SS")：同一秒内复用，整体替换元组以便多线程读取时保持一致
+_TS_CACHE = (-1, "")
+
+
+def _ts() -> str:
+    global _TS_CACHE
+    now = int(time.time())
+    sec, ts = _TS_CACHE
+    if now != sec:
+        ts = time.strftime('%H:%M:%S', time.localtime(now))
+        _TS_CACHE = (now, ts)
+    return ts
+
+
+def _set_if_changed(var: tk.Variable, value) -> None:
+    """值不变时不写 Tk 变量，避免触发 trace 与控件重绘"""
+    if var.get() != value:
+        var.set(value)
+
+
+@lru_cache(maxsize=8)
+def _ppm_header(width: int, height: int) -> bytes:
+    """PPM(P6) 文件头；预览尺寸很少变化，按 (宽, 高) 缓存"""
+    return f"P6\n{width} {height}\n255\n".encode()
+
+
+def _existing_video_names() -> Set[str]:
+    """videos 目录下已有的文件/文件夹名（一次目录读取代替逐个 exists()）"""
+    try:
+        with os.scandir(_VIDEO_DIR) as it:
+            return {e.name for e in it}
+    except FileNotFoundError:
+        return set()
 
 class MCUFrame(ttk.Frame):
     SERIAL_PORT  = "/dev/tty.usbmodem1201"      # ← 修改为实际串口号（Windows 示例）
     BAUDRATE     = 115200
     READ_TIMEOUT = 2.0
     LINE_ENDING  = "\r\n"
+    WEIGHT_POLL_S = 1.0                          # 重量读取周期（秒）
+    LOG_MAX_LINES = 500                          # 日志控件最多保留的行数
 
     CMD = {
         "A_SPEED": "A",
@@ -29,10 +78,29 @@ class MCUFrame(ttk.Frame):
         "B_DIR"  : "BD",
     }
 
+    # 录制模式 → 显示文字
+    _MODE_LABEL = {"frames": "抽帧", "video": "视频"}
+    # 录制按钮文字（按摄像头下标取用）
+    _BTN_START = ("开始录制(摄像头1)", "开始录制(摄像头2)")
+    _BTN_STOP = ("停止录制(摄像头1)", "停止录制(摄像头2)")
+    _BTN_BOTH_START = "同时开始录制(两个摄像头)"
+    _BTN_BOTH_STOP = "同时停止录制(两个摄像头)"
+
+    # 调整值输入框的逐键校验：允许空串、单独的负号或（带负号的）整数；
+    # re.ASCII：只接受 0-9，全角/其他文字的数字 Tcl 的 IntVar 无法解析
+    _INT_RE = re.compile(r"^-?\d*$", re.ASCII)
+
     def __init__(self, master):
         super().__init__(master, padding=10)
         # 先构建 UI（确保日志控件已创建）
         self._build_ui()
+        # 输出目录启动时创建一次，保存时不再逐次 mkdir
+        try:
+            _VIDEO_DIR.mkdir(exist_ok=True)
+        except OSError as e:
+            self._log(f"[目录] 创建 {_VIDEO_DIR} 失败: {e}")
+        # 按钮触发的耗时操作（摄像头录制切换）交给常驻线程池，避免每次点击新建线程
+        self._action_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="action")
         # 初始化摄像头预览
         self._init_preview()
         # 再初始化 MCU 控制器（串口通信逻辑在 mcu_control.py）
@@ -78,6 +146,13 @@ class MCUFrame(ttk.Frame):
         # 底部：日志区域
         self.log = scrolledtext.ScrolledText(self, width=80, height=10, state="disabled", font=("Arial", 10))
         self.log.grid(row=2, column=0, columnspan=3, sticky="nsew", padx=5, pady=5)
+        # 日志行先进缓冲区，每 100ms 合并写入一次控件
+        self._log_buf: deque = deque(maxlen=2000)  # 刷新前积压过多时丢弃最旧的行
+        self._log_flush_scheduled = False
+
+        # 状态栏：录制开始/保存等提示显示在这里，不再弹出模态对话框
+        self.var_status = tk.StringVar(value="")
+        ttk.Label(self, textvariable=self.var_status, anchor="w").grid(row=3, column=0, columnspan=3, sticky="we", padx=5)
 
     def _conveyor_control_block(self):
         """传送带控制区域"""
@@ -149,10 +224,13 @@ class MCUFrame(ttk.Frame):
         # 初始化 OpenCV 录像控制器
         try:
             self.cv_recorder = OpenCVDualRecorder(
-                save_dir=Path(__file__).resolve().parent / "videos",
+                save_dir=_VIDEO_DIR,
                 cam_indices=(0, 1),
                 fourcc_code="mp4v",
                 target_fps=30.0,
+                buffer_size=1,
+                input_fourcc="MJPG",
+                num_buffers=2,
             )
         except Exception as e:
             self.cv_recorder = None
@@ -160,8 +238,8 @@ class MCUFrame(ttk.Frame):
 
         # 摄像头按钮文字
         self.btn_cam_texts = {
-            0: tk.StringVar(value="开始录制(摄像头1)"),
-            1: tk.StringVar(value="开始录制(摄像头2)")
+            0: tk.StringVar(value=self._BTN_START[0]),
+            1: tk.StringVar(value=self._BTN_START[1])
         }
 
         # 摄像头1控制 - 调大按钮
@@ -183,7 +261,7 @@ class MCUFrame(ttk.Frame):
         btn_c2.grid(row=2, column=1, padx=8, pady=6, ipady=4)
 
         # 同时控制两个摄像头按钮
-        self.btn_both_cam_text = tk.StringVar(value="同时开始录制(两个摄像头)")
+        self.btn_both_cam_text = tk.StringVar(value=self._BTN_BOTH_START)
         btn_both = ttk.Button(
             frm,
             textvariable=self.btn_both_cam_text,
@@ -274,21 +352,15 @@ class MCUFrame(ttk.Frame):
         """调整值控制区域"""
         frm = ttk.LabelFrame(self, text="调整值控制")
         
-        self.var_adjustment = tk.StringVar(value="0")
+        self.var_adjustment = tk.IntVar(value=0)
         
         # 数值输入框（去掉左侧文字标签）
         adj_entry = ttk.Entry(frm, textvariable=self.var_adjustment, width=8, font=("Arial", 18))
         adj_entry.grid(row=0, column=0, padx=6, pady=6, sticky="w")
         
-        # 限制只能输入整数
+        # 限制只能输入整数（IntVar 本身不拦截输入，空串/单独负号时 get() 会抛 TclError）
         def validate_integer(P):
-            if P == "": return True
-            if P == "-": return True
-            try:
-                int(P)
-                return True
-            except ValueError:
-                return False
+            return MCUFrame._INT_RE.match(P) is not None
         
         vcmd = (adj_entry.register(validate_integer), '%P')
         adj_entry.config(validate='key', validatecommand=vcmd)
@@ -315,6 +387,16 @@ class MCUFrame(ttk.Frame):
         self.var_weight_port = tk.StringVar(value="/dev/tty.usbserial-D30GNW86")
         self._current_weight_value: float = 0.0  # 保存当前读取的重量值
         self._weight_auto_refresh_id = None  # 用于取消定时器
+        # 串口读取在后台线程进行，结果经队列交给 Tk 主线程；读取器只由后台线程使用
+        self._weight_reader: Optional[WeightReader] = None  # 复用的串口读取器，串口号变化时才重建
+        self._weight_reader_port: Optional[str] = None
+        self._weight_port = self.var_weight_port.get().strip() or "COM3"  # 主线程写入，后台线程读取
+        # 后台线程只保留最新一次读数；主线程定时取走（dirty 表示有尚未显示的新读数）
+        self._weight_slot: Optional[Tuple[str, Optional[float]]] = None
+        self._weight_slot_dirty = False
+        self._weight_slot_lock = threading.Lock()
+        self._weight_stop = threading.Event()
+        self._weight_thread: Optional[threading.Thread] = None
 
         row = 0
         ttk.Label(frm, text="串口号:").grid(row=row, column=0, padx=6, pady=3, sticky="e")
@@ -328,39 +410,87 @@ class MCUFrame(ttk.Frame):
 
         frm.columnconfigure((0,1), weight=1)
 
-        # 启动自动刷新（每1秒）
+        # 启动自动刷新（后台每1秒读取一次）
         self._start_weight_auto_refresh()
 
         return frm
 
     def _start_weight_auto_refresh(self):
-        """启动重量自动刷新定时器"""
-        self._refresh_weight()
-        self._weight_auto_refresh_id = self.after(1000, self._start_weight_auto_refresh)
-
-    def _refresh_weight(self):
+        """启动重量读取线程，并定时在主线程取回结果"""
+        if self._weight_thread is None:
+            self._weight_thread = threading.Thread(target=self._weight_worker, daemon=True)
+            self._weight_thread.start()
+        self._pump_weight()
+
+    def _weight_worker(self):
+        """后台线程：每1秒读取一次重量，(原始文本, 解析出的数值) 写入最新读数槽（失败时写入 None）"""
+        # 按固定节拍调度：下一次读取时间 = 上一次节拍 + 周期，读取耗时不会累积成漂移
+        next_deadline = time.monotonic()
+        while not self._weight_stop.is_set():
+            try:
+                # 读取器常驻，串口读写错误后由 WeightReader 自己在下次读取时重新打开
+                text = self._get_weight_reader(self._weight_port).read_value()
+                reading = (text, WeightReader.extract_number(text))
+            except Exception:
+                reading = None
+            with self._weight_slot_lock:
+                self._weight_slot = reading
+                self._weight_slot_dirty = True
+            next_deadline += self.WEIGHT_POLL_S
+            now = time.monotonic()
+            if next_deadline < now:
+                # 读取超时拖过了节拍：从当前时刻重新对齐，不补读
+                next_deadline = now
+            self._weight_stop.wait(next_deadline - now)
+        self._close_weight_reader()
+
+    def _pump_weight(self):
+        """主线程：每 250ms 查看一次读数槽，只有新读数时才刷新显示（不阻塞）"""
+        self._weight_port = self.var_weight_port.get().strip() or "COM3"
+        with self._weight_slot_lock:
+            dirty = self._weight_slot_dirty
+            reading = self._weight_slot
+            self._weight_slot_dirty = False
+        if dirty:
+            self._refresh_weight(reading)
+        self._weight_auto_refresh_id = self.after(250, self._pump_weight)
+
+    def _refresh_weight(self, reading: Optional[Tuple[str, Optional[float]]]):
         """刷新重量显示（不保存），当重量小于-150时自动停止录制"""
         try:
-            port = self.var_weight_port.get().strip() or "COM3"
-            reader = WeightReader(WeightReaderConfig(port=port, baudrate=9600))
-            text = reader.read_value()
-            value = WeightReader.extract_number(text)
+            if reading is None:
+                raise RuntimeError("读取重量失败")
+            text, value = reading
 
             if value is None:
-                self.var_weight.set(text)
+                _set_if_changed(self.var_weight, text)
                 return
 
             w = float(value)
             self._current_weight_value = w  # 保存当前值供保存使用
             # 支持负数显示
-            self.var_weight.set(f"{w:.2f} (g)")
+            _set_if_changed(self.var_weight, f"{w:.2f} (g)")
 
             # 当重量小于-150时，自动停止两个摄像头录制
             if w < -150:
                 self._auto_stop_cameras()
 
         except Exception as e:
-            self.var_weight.set("ERR")
+            _set_if_changed(self.var_weight, "ERR")
+
+    def _get_weight_reader(self, port: str) -> WeightReader:
+        """返回缓存的 WeightReader；串口号变化或尚未打开时重新创建。"""
+        if self._weight_reader is None or port != self._weight_reader_port:
+            self._close_weight_reader()
+            self._weight_reader = WeightReader(WeightReaderConfig(port=port, baudrate=9600))
+            self._weight_reader_port = port
+        return self._weight_reader
+
+    def _close_weight_reader(self) -> None:
+        if self._weight_reader is not None:
+            self._weight_reader.close()
+        self._weight_reader = None
+        self._weight_reader_port = None
 
     def _auto_stop_cameras(self):
         """自动停止两个摄像头录制（当重量小于-150时触发）"""
@@ -374,35 +504,29 @@ class MCUFrame(ttk.Frame):
         if not recording_0 and not recording_1:
             return  # 都没有在录制，无需操作
         
-        stem = self.basename.get().strip()
-        if not stem:
-            return
-        
-        # 获取录制模式
-        record_mode = self.var_record_mode.get()
-        
         # 停止正在录制的摄像头
         saved_files = []
         if recording_0:
-            _, saved_0 = self.cv_recorder.toggle(0, stem, record_mode)
-            self.btn_cam_texts[0].set("开始录制(摄像头1)")
-            if saved_0 and saved_0.exists():
+            saved_0 = self.cv_recorder.stop(0)
+            _set_if_changed(self.btn_cam_texts[0], self._BTN_START[0])
+            if saved_0 is not None:
                 saved_files.append(str(saved_0))
         
         if recording_1:
-            _, saved_1 = self.cv_recorder.toggle(1, stem, record_mode)
-            self.btn_cam_texts[1].set("开始录制(摄像头2)")
-            if saved_1 and saved_1.exists():
+            saved_1 = self.cv_recorder.stop(1)
+            _set_if_changed(self.btn_cam_texts[1], self._BTN_START[1])
+            if saved_1 is not None:
                 saved_files.append(str(saved_1))
         
         # 更新同时控制按钮
-        self.btn_both_cam_text.set("同时开始录制(两个摄像头)")
+        _set_if_changed(self.btn_both_cam_text, self._BTN_BOTH_START)
         self._set_preview_pause(0, False)
         self._set_preview_pause(1, False)
         
         # 记录日志
         self._log(f"[自动停止] 重量<-150g，已停止录制: {', '.join(saved_files)}")
-        messagebox.showinfo("自动停止录制", f"检测到重量<-150g，已自动停止录制\n保存文件：\n{chr(10).join(saved_files)}")
+        # 不用模态对话框：自动停止发生在称重刷新回调里，模态框会阻塞预览与称重轮询
+        self._toast(f"检测到重量<-150g，已自动停止录制\n保存文件：\n{chr(10).join(saved_files)}")
 
     def _save_weight(self):
         """保存当前重量数据到文件"""
@@ -413,12 +537,9 @@ class MCUFrame(ttk.Frame):
                 return
 
             w = self._current_weight_value
-            save_dir = Path(__file__).resolve().parent / "videos"
-            save_dir.mkdir(exist_ok=True)
-            wgt_file = save_dir / f"{basename}_wgt.txt"
+            wgt_file = _VIDEO_DIR / f"{basename}_wgt.txt"
 
-            with open(wgt_file, "w", encoding="utf-8") as f:
-                f.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')}\t{w:.2f}\n")
+            wgt_file.write_text(f"{time.strftime('%Y-%m-%d %H:%M:%S')}\t{w:.2f}\n", encoding="utf-8")
 
             self._log(f"[重量] {w:.2f} g 已保存到 {wgt_file}")
             messagebox.showinfo("保存成功", f"重量 {w:.2f} g 已保存到 {wgt_file}")
@@ -429,34 +550,33 @@ class MCUFrame(ttk.Frame):
     # ---------------------------- 调整值控制方法 --------------------------- #
     def _increment_adjustment(self):
         """增加调整值"""
-        try:
-            current = float(self.var_adjustment.get())
-            self.var_adjustment.set(str(current + 1))
-        except ValueError:
-            self.var_adjustment.set("1")
+        self.var_adjustment.set(self._adjustment_value() + 1)
 
     def _decrement_adjustment(self):
         """减少调整值"""
+        self.var_adjustment.set(self._adjustment_value() - 1)
+
+    def _adjustment_value(self) -> int:
+        """当前调整值；输入框为空或只有负号时按 0 处理"""
         try:
-            current = float(self.var_adjustment.get())
-            self.var_adjustment.set(str(current - 1))
-        except ValueError:
-            self.var_adjustment.set("-1")
+            return self.var_adjustment.get()
+        except tk.TclError:
+            return 0
 
     def _save_adjustment(self):
         """保存调整值到 adjustments/"""
         try:
-            value = float(self.var_adjustment.get())
+            value = self.var_adjustment.get()
             basename = self.basename.get().strip()
             if not basename:
                 messagebox.showwarning("文件名", "请先输入文件名")
                 return
 
-            adj_file = save_adjustment(basename, value, base_dir=Path(__file__).resolve().parent)
+            adj_file = save_adjustment(basename, value, base_dir=_MODULE_DIR)
             self._log(f"[调整值] {value:.2f} → {adj_file}")
             messagebox.showinfo("保存成功", f"调整值已保存到 {adj_file}")
 
-        except ValueError:
+        except tk.TclError:
             messagebox.showerror("输入错误", "请输入有效的数字")
         except Exception as e:
             messagebox.showerror("保存失败", f"保存调整值失败: {e}")
@@ -465,19 +585,20 @@ class MCUFrame(ttk.Frame):
 
     # ---------------------------- Actions ----------------------------- #
     def _apply_speed(self,tag,var):
-        try: ui=int(var.get()); assert 0<=ui<=100
-        except Exception: messagebox.showwarning("输入","速度需 0‑100 整数"); return
+        s=var.get().strip()
+        if not s.isdecimal() or not 0<=(ui:=int(s))<=100:
+            messagebox.showwarning("输入","速度需 0‑100 整数"); return
         # 发送到 MCU 控制器
         self.mcu_ctrl.set_motor_speed(tag, ui)
 
     def _apply_dir(self,tag,var):
-        code={"停止":"0","正转":"1","反转":"2"}[var.get()]
         # 发送到 MCU 控制器（内部负责映射与发送）
         self.mcu_ctrl.set_motor_direction(tag, var.get())
 
     def _apply_fan(self):
-        try: v=int(self.var_fan.get()); assert 0<=v<=100
-        except Exception: messagebox.showwarning("输入","风机速度需 0‑100 整数"); return
+        s=self.var_fan.get().strip()
+        if not s.isdecimal() or not 0<=(v:=int(s))<=100:
+            messagebox.showwarning("输入","风机速度需 0‑100 整数"); return
         self.mcu_ctrl.set_fan_speed(v)
 
     # _get_weight 已移除，改为每1秒自动刷新（_refresh_weight）
@@ -486,23 +607,62 @@ class MCUFrame(ttk.Frame):
     def _log(self,msg):
         # 在日志控件创建前的调用，降级打印到控制台以避免崩溃
         if not hasattr(self, "log"):
-            print(f"{time.strftime('%H:%M:%S')}  {msg}")
+            print(f"{_ts()}  {msg}")
+            return
+        self._log_buf.append(f"{_ts()}  {msg}\n")
+        if not self._log_flush_scheduled:
+            self._log_flush_scheduled = True
+            self.after(100, self._flush_log)
+
+    def _flush_log(self):
+        self._log_flush_scheduled = False
+        lines = []
+        while self._log_buf:
+            lines.append(self._log_buf.popleft())
+        if not lines:
             return
-        self.log.config(state="normal"); self.log.insert(tk.END,f"{time.strftime('%H:%M:%S')}  {msg}\n")
+        self.log.config(state="normal"); self.log.insert(tk.END, "".join(lines))
+        # 只保留最近 LOG_MAX_LINES 行，防止长时间运行时控件无限增长
+        self.log.delete("1.0", f"end-{self.LOG_MAX_LINES}l")
         self.log.config(state="disabled"); self.log.yview_moveto(1.0)
 
+    def _set_status(self, text: str) -> None:
+        """更新状态栏并写日志；可在后台线程调用（经 after 转回主线程）"""
+        self.after(0, self._show_status, text)
+
+    def _show_status(self, text: str) -> None:
+        self.var_status.set(text)
+        self._log(text)
+
+    def _toast(self, msg: str, ms: int = 2000) -> None:
+        """在窗口右上角显示一条无边框提示，ms 毫秒后自动消失（不阻塞事件循环）"""
+        top = tk.Toplevel(self)
+        top.overrideredirect(True)
+        ttk.Label(top, text=msg, justify="left").pack(padx=12, pady=8)
+        top.update_idletasks()
+        x = self.winfo_rootx() + self.winfo_width() - top.winfo_reqwidth() - 16
+        top.geometry(f"+{max(x, 0)}+{self.winfo_rooty() + 16}")
+        top.after(ms, top.destroy)
+
     # --------------------------- 摄像头控制相关方法 --------------------------- #
     def _thread(self,fn,*a):
-        if not self.basename.get().strip(): messagebox.showwarning("Name","请先输入文件名"); return
-        threading.Thread(target=fn,args=a,daemon=True).start()
+        # 文件名与录制模式在主线程各读取一次，作为末尾两个参数传给 fn（后台线程不再访问 Tk 变量）
+        stem=self.basename.get().strip()
+        if not stem: messagebox.showwarning("Name","请先输入文件名"); return
+        self._action_pool.submit(fn,*a,stem,self.var_record_mode.get())
 
     # --------------------------- 摄像头预览 --------------------------- #
     def _on_preview_scale_change(self, value: str) -> None:
         try:
-            pct = int(float(value) * 100)
+            scale = float(value)
+            pct = int(scale * 100)
         except Exception:
-            pct = 40
-        if hasattr(self, "_preview_scale_label"):
+            scale, pct = 0.4, 40
+        # 预览线程按此比例缩放（在采集线程中完成，不占用 Tk 主线程）
+        self._preview_target_scale = max(0.1, min(scale, 1.5))
+        # 拖动滑块时百分比多数情况下不变，只在变化时更新标签
+        if hasattr(self, "_preview_scale_label") and pct != getattr(self, "_preview_scale_pct", None):
+            self._preview_scale_pct = pct
             self._preview_scale_label.config(text=f"{pct}%")
 
     def _toggle_preview_enabled(self) -> None:
@@ -521,6 +681,9 @@ class MCUFrame(ttk.Frame):
                     self._preview_frames[idx] = None
                     self._preview_status[idx] = "预览关闭"
         self._refresh_preview_images()
+        # 关闭预览后定时刷新不再续约；重新开启时恢复
+        if enabled and cv2 is not None and self._preview_update_id is None:
+            self._schedule_preview_update()
 
     def _init_preview(self) -> None:
         self._preview_frames = {}
@@ -529,14 +692,21 @@ class MCUFrame(ttk.Frame):
         self._preview_lock = threading.Lock()
         self._preview_caps_lock = threading.Lock()
         self._preview_caps = {}
-        self._preview_stop_events = {}
-        self._preview_threads = {}
+        self._preview_stop_event = threading.Event()
+        self._preview_thread = None  # 两路预览共用一个采集线程
         self._preview_pause_flags = {}
+        # 每来一帧新画面序号 +1；界面按 (序号, 缩放) 判断是否需要重新生成图像
+        self._preview_seq = {}
+        self._preview_last_key = {}
+        self._preview_scratch = {}  # 各摄像头缩放用的复用缓冲区（仅预览线程访问）
         self._preview_update_id = None
         self._preview_capture_size = (640, 360)
         self._preview_capture_fps = 15
         self._preview_ui_interval_ms = 120
-        self._preview_read_delay_s = 0.03
+        try:
+            self._preview_target_scale = max(0.1, min(float(self._preview_scale_var.get()), 1.5))
+        except Exception:
+            self._preview_target_scale = 0.4
 
         self._preview_enabled = True
         if hasattr(self, "_preview_enabled_var"):
@@ -552,6 +722,8 @@ class MCUFrame(ttk.Frame):
             self._preview_status[idx] = "未连接" if self._preview_enabled else "预览关闭"
             self._preview_images[idx] = None
             self._preview_pause_flags[idx] = False
+            self._preview_seq[idx] = 0
+            self._preview_last_key[idx] = None
 
         if cv2 is None:
             for idx in cam_indices:
@@ -559,21 +731,19 @@ class MCUFrame(ttk.Frame):
                     self._preview_labels[idx].config(text="OpenCV 未安装")
             return
 
-        for idx in cam_indices:
-            stop_event = threading.Event()
-            self._preview_stop_events[idx] = stop_event
-            thread = threading.Thread(
-                target=self._preview_loop,
-                args=(idx, stop_event),
-                daemon=True,
-            )
-            self._preview_threads[idx] = thread
-            thread.start()
+        self._preview_thread = threading.Thread(
+            target=self._preview_loop,
+            args=(self._preview_stop_event,),
+            daemon=True,
+        )
+        self._preview_thread.start()
 
         self._schedule_preview_update()
 
     def _set_preview_state(self, cam_idx: int, frame, status: str) -> None:
         with self._preview_lock:
+            if frame is not None:
+                self._preview_seq[cam_idx] += 1
             self._preview_frames[cam_idx] = frame
             if status:
                 self._preview_status[cam_idx] = status
@@ -581,13 +751,13 @@ class MCUFrame(ttk.Frame):
                 self._preview_status[cam_idx] = ""
 
     def _open_preview_capture(self, cam_idx: int):
-        cap = cv2.VideoCapture(cam_idx, cv2.CAP_DSHOW)
-        if not cap.isOpened():
-            cap.release()
-            cap = cv2.VideoCapture(cam_idx)
+        cap = open_capture(cam_idx)
         if not cap.isOpened():
             cap.release()
             return None
+        # MJPG 需在分辨率之前设置；缓冲 1 帧，预览总是拿到最新画面（不支持时会被忽略）
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
         if self._preview_capture_size:
             w, h = self._preview_capture_size
             cap.set(cv2.CAP_PROP_FRAME_WIDTH, float(w))
@@ -596,111 +766,156 @@ class MCUFrame(ttk.Frame):
             cap.set(cv2.CAP_PROP_FPS, float(self._preview_capture_fps))
         return cap
 
-    def _preview_loop(self, cam_idx: int, stop_event: threading.Event) -> None:
-        cap = None
-        while not stop_event.is_set():
-            if not self._preview_enabled:
-                if cap is not None:
-                    try:
-                        cap.release()
-                    except Exception:
-                        pass
-                    cap = None
-                    with self._preview_caps_lock:
-                        self._preview_caps[cam_idx] = None
-                self._set_preview_state(cam_idx, None, "预览关闭")
-                time.sleep(0.2)
-                continue
+    def _release_preview_cap(self, cam_idx: int, cap) -> None:
+        if cap is not None:
+            try:
+                cap.release()
+            except Exception:
+                pass
+            with self._preview_caps_lock:
+                self._preview_caps[cam_idx] = None
+        return None
+
+    def _preview_loop(self, stop_event: threading.Event) -> None:
+        """单线程轮询所有预览摄像头：按各自状态（关闭/暂停/录制/实时）处理，实时画面一起等待就绪"""
+        cam_indices = self._preview_cam_indices
+        caps = {idx: None for idx in cam_indices}
+        last_raw = {idx: None for idx in cam_indices}  # 录制中上一次取到的录像帧，同一帧不重复处理
+        last_retrieve = {idx: 0.0 for idx in cam_indices}
+        last_grab = {idx: 0.0 for idx in cam_indices}
+        retry_at = {idx: 0.0 for idx in cam_indices}  # 打开/读取失败后，到此时刻前不重试
+        # 各摄像头上一轮的模式（off/paused/recording/live）：只在模式切换时释放采集、更新状态
+        last_mode = {idx: None for idx in cam_indices}
+        ui_interval_s = self._preview_ui_interval_ms / 1000.0
+        # waitAny 仅部分后端（如 V4L2）支持；首次失败后改为逐个 grab()
+        use_wait_any = hasattr(cv2.VideoCapture, "waitAny")
 
-            recording = False
-            if self.cv_recorder is not None:
-                recording = self.cv_recorder.is_recording(cam_idx)
-            if self._preview_pause_flags.get(cam_idx) and not recording:
-                if cap is not None:
-                    try:
-                        cap.release()
-                    except Exception:
-                        pass
-                    cap = None
-                    with self._preview_caps_lock:
-                        self._preview_caps[cam_idx] = None
-                self._set_preview_state(cam_idx, None, "暂停中")
-                time.sleep(0.15)
-                continue
-            if recording:
-                if cap is not None:
-                    try:
-                        cap.release()
-                    except Exception:
-                        pass
-                    cap = None
-                    with self._preview_caps_lock:
-                        self._preview_caps[cam_idx] = None
-                frame = None
-                if self.cv_recorder is not None and hasattr(self.cv_recorder, "get_latest_frame"):
-                    frame = self.cv_recorder.get_latest_frame(cam_idx)
-                if frame is not None:
-                    self._set_preview_state(cam_idx, frame, "")
+        while not stop_event.is_set():
+            live = []
+            any_recording = False
+            now = time.monotonic()
+            for idx in cam_indices:
+                recording = False
+                if self.cv_recorder is not None:
+                    recording = self.cv_recorder.is_recording(idx)
+                if not self._preview_enabled:
+                    mode = "off"
+                elif recording:
+                    mode = "recording"
+                elif self._preview_pause_flags.get(idx):
+                    mode = "paused"
                 else:
-                    self._set_preview_state(cam_idx, None, "录制中")
-                time.sleep(0.05)
-                continue
+                    mode = "live"
+
+                if mode != last_mode[idx]:
+                    # 进入不需要预览采集的模式时释放一次；进入 live 时由下方按需打开
+                    if mode != "live":
+                        caps[idx] = self._release_preview_cap(idx, caps[idx])
+                    if mode == "off":
+                        self._set_preview_state(idx, None, "预览关闭")
+                    elif mode == "paused":
+                        self._set_preview_state(idx, None, "暂停中")
+                    last_raw[idx] = None
+                    last_mode[idx] = mode
+
+                if mode in ("off", "paused"):
+                    continue
+                if mode == "recording":
+                    any_recording = True
+                    frame = None
+                    if self.cv_recorder is not None and hasattr(self.cv_recorder, "get_latest_frame"):
+                        frame = self.cv_recorder.get_latest_frame(idx)
+                    if frame is None:
+                        self._set_preview_state(idx, None, "录制中")
+                    elif frame is not last_raw[idx]:
+                        last_raw[idx] = frame
+                        self._set_preview_state(idx, self._prepare_preview_frame(idx, frame), "")
+                    continue
 
-            if cap is None or not cap.isOpened():
-                cap = self._open_preview_capture(cam_idx)
-                with self._preview_caps_lock:
-                    self._preview_caps[cam_idx] = cap
+                cap = caps[idx]
                 if cap is None or not cap.isOpened():
-                    self._set_preview_state(cam_idx, None, "无信号")
-                    time.sleep(0.4)
-                    continue
+                    if now < retry_at[idx]:
+                        continue
+                    cap = caps[idx] = self._open_preview_capture(idx)
+                    with self._preview_caps_lock:
+                        self._preview_caps[idx] = cap
+                    if cap is None or not cap.isOpened():
+                        self._set_preview_state(idx, None, "无信号")
+                        retry_at[idx] = now + 0.4
+                        continue
+                live.append(idx)
+
+            if not live:
+                # 录制中需按录像帧率取帧；关闭/暂停时只需偶尔检查状态切换
+                stop_event.wait(0.05 if any_recording else 0.2)
+                continue
 
-            ok, frame = cap.read()
-            if not ok or frame is None:
+            # 等待任一路画面就绪（就绪的流已 grab）；按相机原生帧率阻塞、始终丢弃旧帧
+            grabbed = {}
+            if use_wait_any and len(live) > 1:
                 try:
-                    cap.release()
+                    ok, ready = cv2.VideoCapture.waitAny([caps[i] for i in live], 100_000_000)
+                    grabbed = {live[j]: True for j in ready} if ok else {}
                 except Exception:
-                    pass
-                cap = None
-                with self._preview_caps_lock:
-                    self._preview_caps[cam_idx] = None
-                self._set_preview_state(cam_idx, None, "无信号")
-                time.sleep(0.2)
-                continue
+                    use_wait_any = False
+            if not use_wait_any or len(live) == 1:
+                grabbed = {idx: caps[idx].grab() for idx in live}
 
-            self._set_preview_state(cam_idx, frame, "")
-            time.sleep(self._preview_read_delay_s)
+            now = time.monotonic()
+            for idx, ok in grabbed.items():
+                frame = None
+                if ok and now - last_grab[idx] > 0.2:
+                    # 该路已有一段时间没 grab（刚打开/刚恢复实时）：驱动缓冲里可能还积压旧帧，
+                    # 最多再取 2 帧丢掉，保证解码的是最新画面（BUFFERSIZE=1 不被所有后端支持）
+                    for _ in range(2):
+                        if not caps[idx].grab():
+                            break
+                last_grab[idx] = now
+                if ok:
+                    # 只在到了界面刷新间隔时才解码
+                    if now - last_retrieve[idx] < ui_interval_s:
+                        continue
+                    last_retrieve[idx] = now
+                    ok, frame = caps[idx].retrieve()
+                if not ok or frame is None:
+                    caps[idx] = self._release_preview_cap(idx, caps[idx])
+                    self._set_preview_state(idx, None, "无信号")
+                    retry_at[idx] = now + 0.2
+                    continue
+                self._set_preview_state(idx, self._prepare_preview_frame(idx, frame), "")
 
-        if cap is not None:
-            try:
-                cap.release()
-            except Exception:
-                pass
-        with self._preview_caps_lock:
-            self._preview_caps[cam_idx] = None
+        for idx in cam_indices:
+            caps[idx] = self._release_preview_cap(idx, caps[idx])
 
     def _schedule_preview_update(self) -> None:
         self._refresh_preview_images()
+        if not self._preview_enabled:
+            self._preview_update_id = None
+            return
         self._preview_update_id = self.after(self._preview_ui_interval_ms, self._schedule_preview_update)
 
     def _refresh_preview_images(self) -> None:
         if not hasattr(self, "_preview_labels"):
             return
-        try:
-            scale = float(self._preview_scale_var.get())
-        except Exception:
-            scale = 0.4
+        # 窗口最小化/未显示时不生成图像；恢复显示后按最新画面刷新
+        if not self.winfo_viewable():
+            return
 
         with self._preview_lock:
             snapshot = {
-                idx: (self._preview_frames.get(idx), self._preview_status.get(idx, ""))
+                idx: (self._preview_frames.get(idx), self._preview_status.get(idx, ""), self._preview_seq.get(idx, 0))
                 for idx in self._preview_cam_indices
             }
 
-        for idx, (frame, status) in snapshot.items():
+        for idx, (frame, status, seq) in snapshot.items():
             label = self._preview_labels.get(idx)
             if label is None:
                 continue
+            # 画面（或无画面时的状态文字）与上次相同：保留当前图像，不重新生成
+            key = seq if frame is not None else ("status", status)
+            if key == self._preview_last_key.get(idx):
+                continue
+            self._preview_last_key[idx] = key
             if frame is None:
                 label.config(
                     image=self._preview_placeholder,
@@ -710,7 +925,7 @@ class MCUFrame(ttk.Frame):
                 self._preview_images[idx] = None
                 continue
 
-            photo = self._frame_to_photoimage(frame, scale)
+            photo = self._frame_to_photoimage(frame)
             if photo is None:
                 label.config(
                     image=self._preview_placeholder,
@@ -723,22 +938,33 @@ class MCUFrame(ttk.Frame):
             label.config(image=photo, text="")
             self._preview_images[idx] = photo
 
-    def _frame_to_photoimage(self, frame, scale: float):
-        if cv2 is None:
-            return None
+    def _prepare_preview_frame(self, cam_idx: int, frame):
+        """预览线程中调用：按当前比例缩放并转为 RGB，供 _frame_to_photoimage 直接使用"""
+        h, w = frame.shape[:2]
+        scale = self._preview_target_scale
+        target_w = max(1, int(w * scale))
+        target_h = max(1, int(h * scale))
+        if target_w != w or target_h != h:
+            # 缩放结果写入复用的缓冲区（尺寸变化时才重新分配）；预览用 INTER_LINEAR 足够，远快于 INTER_AREA
+            scratch = self._preview_scratch.get(cam_idx)
+            if scratch is None or scratch.shape != (target_h, target_w, 3):
+                scratch = self._preview_scratch[cam_idx] = np.empty((target_h, target_w, 3), np.uint8)
+            frame = cv2.resize(frame, (target_w, target_h), dst=scratch, interpolation=cv2.INTER_LINEAR)
+        # RGB 结果会交给界面线程，每帧新分配，避免被下一帧覆盖
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+    def _frame_to_photoimage(self, rgb):
         try:
-            h, w = frame.shape[:2]
-            scale = max(0.1, min(scale, 1.5))
-            target_w = max(1, int(w * scale))
-            target_h = max(1, int(h * scale))
-            if target_w != w or target_h != h:
-                frame = cv2.resize(frame, (target_w, target_h), interpolation=cv2.INTER_AREA)
-            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            ok, buf = cv2.imencode(".png", rgb)
-            if not ok:
-                return None
-            data = base64.b64encode(buf).decode("ascii")
-            return tk.PhotoImage(data=data, format="png")
+            target_h, target_w = rgb.shape[:2]
+            if ImageTk is not None:
+                # frombuffer 直接引用 ndarray 内存，不额外复制
+                img = Image.frombuffer("RGB", (target_w, target_h), rgb, "raw", "RGB", 0, 1)
+                return ImageTk.PhotoImage(img, master=self)
+            # 无 Pillow：交给 Tk 未压缩的 PPM(P6)，省去 PNG 压缩与 base64
+            # join 直接读取像素缓冲区：只复制一次（tobytes() + 拼接会复制两次）；
+            # 必须是 bytes，tkinter 不会把 bytearray 当作二进制数据传给 Tk
+            data = b"".join((_ppm_header(target_w, target_h), memoryview(rgb)))
+            return tk.PhotoImage(data=data, format="PPM")
         except Exception:
             return None
 
@@ -763,10 +989,9 @@ class MCUFrame(ttk.Frame):
                 pass
             self._preview_update_id = None
 
-        for event in self._preview_stop_events.values():
-            event.set()
-        for thread in self._preview_threads.values():
-            thread.join(timeout=1.0)
+        self._preview_stop_event.set()
+        if self._preview_thread is not None:
+            self._preview_thread.join(timeout=1.0)
 
         with self._preview_caps_lock:
             for cap in self._preview_caps.values():
@@ -785,32 +1010,26 @@ class MCUFrame(ttk.Frame):
                 self.after_cancel(self._weight_auto_refresh_id)
             except Exception:
                 pass
+        # 读取器由后台线程在退出循环时关闭
+        self._weight_stop.set()
+        self._action_pool.shutdown(wait=False)
 
-    def _toggle_camera(self, cam_idx: int):
+    def _toggle_camera(self, cam_idx: int, stem: str, record_mode: str):
         if self.cv_recorder is None:
             messagebox.showerror("Camera", "摄像头控制器未初始化")
             return
         try:
-            # 获取录制模式
-            record_mode = self.var_record_mode.get()
-
             # 录制前暂停预览以避免占用
             self._set_preview_pause(cam_idx, True)
             time.sleep(0.15)
             
-            # 开始前检查文件/文件夹是否存在
-            stem = self.basename.get().strip()
-            cam_label = str(cam_idx + 1)
-            if record_mode == "frames":
-                candidate = (Path(__file__).resolve().parent / "videos" / f"{stem}_{cam_label}")
-            else:
-                candidate = (Path(__file__).resolve().parent / "videos" / f"{stem}_{cam_label}.mp4")
-            
+            # 开始前检查文件/文件夹是否存在（停止录制时不需要候选路径）
             if not self.cv_recorder.is_recording(cam_idx):
-                if candidate.exists():
+                name = self.cv_recorder.output_name(cam_idx, stem, record_mode)
+                if name in _existing_video_names():
                     choice = messagebox.askyesnocancel(
                         "文件已存在",
-                        f"{candidate}\n已存在。是否覆盖?\n是=覆盖，否=添加时间后缀，取消=放弃开始录制",
+                        f"{_VIDEO_DIR / name}\n已存在。是否覆盖?\n是=覆盖，否=添加时间后缀，取消=放弃开始录制",
                     )
                     if choice is None:
                         self._set_preview_pause(cam_idx, False)
@@ -822,16 +1041,16 @@ class MCUFrame(ttk.Frame):
 
             started, saved = self.cv_recorder.toggle(cam_idx, stem, record_mode)
             if started:
-                self.btn_cam_texts[cam_idx].set(f"停止录制(摄像头{cam_idx+1})")
-                mode_text = "抽帧" if record_mode == "frames" else "视频"
-                messagebox.showinfo("Started", f"摄像头{cam_idx+1}: 开始录制 ({mode_text}模式)")
+                self.btn_cam_texts[cam_idx].set(self._BTN_STOP[cam_idx])
+                mode_text = self._MODE_LABEL.get(record_mode, "视频")
+                self._set_status(f"摄像头{cam_idx+1}: 开始录制 ({mode_text}模式)")
             else:
-                if saved and saved.exists():
-                    messagebox.showinfo("Saved", f"摄像头{cam_idx+1}: 保存成功 → {saved}")
+                if saved is not None:
+                    self._set_status(f"摄像头{cam_idx+1}: 保存成功 → {saved}")
                 else:
                     messagebox.showwarning("Saved", f"摄像头{cam_idx+1}: 停止录制，未找到保存文件")
                 # 停止后还原按钮文字
-                self.btn_cam_texts[cam_idx].set(f"开始录制(摄像头{cam_idx+1})")
+                self.btn_cam_texts[cam_idx].set(self._BTN_START[cam_idx])
                 self._set_preview_pause(cam_idx, False)
             
             # 更新"同时控制"按钮的状态
@@ -849,23 +1068,20 @@ class MCUFrame(ttk.Frame):
         recording_1 = self.cv_recorder.is_recording(1)
         
         if recording_0 and recording_1:
-            self.btn_both_cam_text.set("同时停止录制(两个摄像头)")
+            self.btn_both_cam_text.set(self._BTN_BOTH_STOP)
         elif not recording_0 and not recording_1:
-            self.btn_both_cam_text.set("同时开始录制(两个摄像头)")
+            self.btn_both_cam_text.set(self._BTN_BOTH_START)
         else:
             # 状态不一致时，显示提示性文字
             self.btn_both_cam_text.set("同时控制(状态不一致)")
 
-    def _toggle_both_cameras(self):
+    def _toggle_both_cameras(self, stem: str, record_mode: str):
         """同时控制两个摄像头的录制"""
         if self.cv_recorder is None:
             messagebox.showerror("Camera", "摄像头控制器未初始化")
             return
         
         try:
-            # 获取录制模式
-            record_mode = self.var_record_mode.get()
-            
             # 检查两个摄像头的状态
             recording_0 = self.cv_recorder.is_recording(0)
             recording_1 = self.cv_recorder.is_recording(1)
@@ -879,28 +1095,17 @@ class MCUFrame(ttk.Frame):
                 messagebox.showwarning("状态不一致", f"{msg}。\n请先确保两个摄像头处于相同状态（都开启或都关闭）后再使用此按钮。")
                 return
             
-            stem = self.basename.get().strip()
-            
             # 如果两个摄像头都未录制，则同时开始录制
             if not recording_0:
                 self._set_preview_pause(0, True)
                 self._set_preview_pause(1, True)
                 time.sleep(0.15)
                 # 检查文件/文件夹是否存在
-                if record_mode == "frames":
-                    candidate_1 = (Path(__file__).resolve().parent / "videos" / f"{stem}_1")
-                    candidate_2 = (Path(__file__).resolve().parent / "videos" / f"{stem}_2")
-                else:
-                    candidate_1 = (Path(__file__).resolve().parent / "videos" / f"{stem}_1.mp4")
-                    candidate_2 = (Path(__file__).resolve().parent / "videos" / f"{stem}_2.mp4")
+                names = [self.cv_recorder.output_name(i, stem, record_mode) for i in (0, 1)]
+                existing = _existing_video_names()
+                existing_files = [str(_VIDEO_DIR / n) for n in names if n in existing]
                 
-                if candidate_1.exists() or candidate_2.exists():
-                    existing_files = []
-                    if candidate_1.exists():
-                        existing_files.append(str(candidate_1))
-                    if candidate_2.exists():
-                        existing_files.append(str(candidate_2))
-                    
+                if existing_files:
                     choice = messagebox.askyesnocancel(
                         "文件已存在",
                         f"以下文件已存在:\n{chr(10).join(existing_files)}\n\n是否覆盖?\n是=覆盖，否=添加时间后缀，取消=放弃开始录制",
@@ -914,47 +1119,45 @@ class MCUFrame(ttk.Frame):
                         suffix = time.strftime("_%Y%m%d_%H%M%S")
                         stem = stem + suffix
                 
-                # 同时开始两个摄像头的录制
-                started_0, _ = self.cv_recorder.toggle(0, stem, record_mode)
-                started_1, _ = self.cv_recorder.toggle(1, stem, record_mode)
-                
-                if started_0 and started_1:
-                    # 更新按钮文字
-                    self.btn_cam_texts[0].set("停止录制(摄像头1)")
-                    self.btn_cam_texts[1].set("停止录制(摄像头2)")
-                    self.btn_both_cam_text.set("同时停止录制(两个摄像头)")
-                    mode_text = "抽帧" if record_mode == "frames" else "视频"
-                    messagebox.showinfo("Started", f"两个摄像头同时开始录制 ({mode_text}模式)")
-                else:
-                    # 如果有一个失败，尝试停止已开始的那个
-                    if started_0 and not started_1:
-                        self.cv_recorder.toggle(0, stem, record_mode)  # 停止摄像头0
-                        messagebox.showerror("Error", "摄像头2启动失败，已停止摄像头1")
-                    elif started_1 and not started_0:
-                        self.cv_recorder.toggle(1, stem, record_mode)  # 停止摄像头1
-                        messagebox.showerror("Error", "摄像头1启动失败，已停止摄像头2")
-                    else:
-                        messagebox.showerror("Error", "两个摄像头都启动失败")
-                    self._set_preview_pause(0, False)
-                    self._set_preview_pause(1, False)
+                # 同时开始两个摄像头的录制：并行打开，总耗时约等于较慢的一个
+                with ThreadPoolExecutor(max_workers=2) as ex:
+                    f0 = ex.submit(self.cv_recorder.start, 0, stem, record_mode)
+                    f1 = ex.submit(self.cv_recorder.start, 1, stem, record_mode)
+                err_0, err_1 = f0.exception(), f1.exception()
+                # 如果有一个失败，只释放已开始的那个
+                if err_0 and err_1:
+                    raise RuntimeError(f"两个摄像头都启动失败: {err_0}")
+                if err_1:
+                    self.cv_recorder.stop(0)
+                    raise RuntimeError(f"摄像头2启动失败，已停止摄像头1: {err_1}")
+                if err_0:
+                    self.cv_recorder.stop(1)
+                    raise RuntimeError(f"摄像头1启动失败，已停止摄像头2: {err_0}")
+
+                # 更新按钮文字
+                self.btn_cam_texts[0].set(self._BTN_STOP[0])
+                self.btn_cam_texts[1].set(self._BTN_STOP[1])
+                self.btn_both_cam_text.set(self._BTN_BOTH_STOP)
+                mode_text = self._MODE_LABEL.get(record_mode, "视频")
+                self._set_status(f"两个摄像头同时开始录制 ({mode_text}模式)")
             else:
-                # 两个摄像头都在录制，则同时停止
-                _, saved_0 = self.cv_recorder.toggle(0, stem, record_mode)
-                _, saved_1 = self.cv_recorder.toggle(1, stem, record_mode)
+                # 两个摄像头都在录制，则同时停止：并行等待两路写入线程收尾，总耗时约等于较慢的一个
+                with ThreadPoolExecutor(max_workers=2) as ex:
+                    saved_0, saved_1 = ex.map(self.cv_recorder.stop, (0, 1))
                 
                 # 更新按钮文字
-                self.btn_cam_texts[0].set("开始录制(摄像头1)")
-                self.btn_cam_texts[1].set("开始录制(摄像头2)")
-                self.btn_both_cam_text.set("同时开始录制(两个摄像头)")
+                self.btn_cam_texts[0].set(self._BTN_START[0])
+                self.btn_cam_texts[1].set(self._BTN_START[1])
+                self.btn_both_cam_text.set(self._BTN_BOTH_START)
                 
                 saved_files = []
-                if saved_0 and saved_0.exists():
+                if saved_0 is not None:
                     saved_files.append(str(saved_0))
-                if saved_1 and saved_1.exists():
+                if saved_1 is not None:
                     saved_files.append(str(saved_1))
                 
                 if saved_files:
-                    messagebox.showinfo("Saved", f"两个摄像头录制已停止，保存文件:\n{chr(10).join(saved_files)}")
+                    self._set_status(f"两个摄像头录制已停止，保存文件: {', '.join(saved_files)}")
                 else:
                     messagebox.showwarning("Saved", "两个摄像头录制已停止，但未找到保存文件")
                 self._set_preview_pause(0, False)
@@ -982,14 +1185,9 @@ class DualControlApp(tk.Tk):
         self.protocol("WM_DELETE_WINDOW", self._on_close)
         
         # 统一字体配置
+        # 配置根样式 "."，所有 ttk 控件类继承（macOS和Linux使用 Arial）
         style=ttk.Style(self)
-        if sys.platform.startswith("win"):
-            for w in ("TLabel","TButton","TEntry","TNotebook","TFrame"):
-                style.configure(w,font=("Segoe UI",11))
-        else:
-            # macOS和Linux的字体配置
-            for w in ("TLabel","TButton","TEntry","TNotebook","TFrame"):
-                style.configure(w,font=("Arial",11))
+        style.configure(".",font=("Segoe UI" if sys.platform.startswith("win") else "Arial",11))
 
     def _on_close(self):
         if hasattr(self, "mcu"):
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import queue
 import threading
 import time
 from typing import Callable, Optional
@@ -16,6 +17,7 @@ class MCUController:
     """
     MCU 串口控制模块：
     - 负责打开串口、发送命令、后台读取日志行并回调到 UI。
+    - 命令放入队列由后台写线程发送，调用方（UI 按钮回调）不会被串口写阻塞。
     - 封装了电机速度/方向与风机速度的指令格式。
     """
 
@@ -27,6 +29,8 @@ class MCUController:
         "B_DIR": "BD",
     }
 
+    READ_POLL_S = 0.2  # 读线程阻塞读的超时（秒）
+
     def __init__(
         self,
         port: str,
@@ -44,9 +48,12 @@ class MCUController:
         self._ser: Optional["serial.Serial"] = None
         self._stop = threading.Event()
         self._reader_thread: Optional[threading.Thread] = None
+        self._tx_queue: "queue.Queue[Optional[bytes]]" = queue.Queue()
+        self._writer_thread: Optional[threading.Thread] = None
 
         self._open()
         self._start_reader()
+        self._start_writer()
 
     # ---------------------- lifecycle ---------------------- #
     def _open(self) -> None:
@@ -67,6 +74,14 @@ class MCUController:
             # 允许无设备环境下运行（UI 仍可工作）
             self._ser = None
             self.on_line(f"[串口初始化失败] {exc}")
+            return
+        # 读线程用短超时阻塞读，close() 时最多 READ_POLL_S 即可退出；写超时仍为 read_timeout_s
+        self._ser.timeout = self.READ_POLL_S
+        try:
+            # Linux USB 串口：关闭 16ms 合包延迟（其他平台不支持，忽略）
+            self._ser.set_low_latency_mode(True)
+        except Exception:
+            pass
 
     def _start_reader(self) -> None:
         if self._reader_thread is not None:
@@ -74,8 +89,17 @@ class MCUController:
         self._reader_thread = threading.Thread(target=self._reader_loop, daemon=True)
         self._reader_thread.start()
 
+    def _start_writer(self) -> None:
+        if self._writer_thread is not None or self._ser is None:
+            return
+        self._writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self._writer_thread.start()
+
     def close(self) -> None:
         self._stop.set()
+        self._tx_queue.put(None)  # 唤醒写线程退出
+        if self._writer_thread is not None:
+            self._writer_thread.join(timeout=1.0)
         if self._reader_thread is not None:
             self._reader_thread.join(timeout=1.0)
         if self._ser is not None:
@@ -91,32 +115,42 @@ class MCUController:
             return
         raw = (text + self.line_ending).encode()
         self.on_line(f">>> {text}   ({raw.hex(' ')})")
-        try:
-            self._ser.write(raw)
-            self._ser.flush()
-        except SerialException as exc:
-            self.on_line(f"[写错误] {exc}")
+        self._tx_queue.put(raw)
+
+    def _writer_loop(self) -> None:
+        while True:
+            raw = self._tx_queue.get()
+            if raw is None or self._stop.is_set():
+                return
+            try:
+                self._ser.write(raw)
+                self._ser.flush()
+            except SerialException as exc:
+                self.on_line(f"[写错误] {exc}")
 
     def _reader_loop(self) -> None:
-        buf = ""
-        seps = ("\r\n", "\n", "\r")
+        buf = bytearray()
         while not self._stop.is_set():
             if self._ser is None:
                 time.sleep(0.1)
                 continue
             try:
-                if self._ser.in_waiting:
-                    buf += self._ser.read(self._ser.in_waiting).decode(errors="ignore")
-                    while any(s in buf for s in seps):
-                        for sep in seps:
-                            if sep in buf:
-                                line, buf = buf.split(sep, 1)
-                                line = line.strip()
-                                if line:
-                                    self.on_line(line)
-                                break
-                else:
-                    time.sleep(0.05)
+                # 阻塞读：有数据立即返回（一次取走已到达的全部字节），无数据最多等 READ_POLL_S 后检查退出
+                chunk = self._ser.read(self._ser.in_waiting or 1)
+                if not chunk:
+                    continue
+                # 按字节累积，只解码完整的行：USB 分包把一个 UTF-8 字符拆到两次读取时不会出现乱码
+                buf += chunk
+                end = max(buf.rfind(b"\n"), buf.rfind(b"\r")) + 1
+                if not end:
+                    continue
+                complete = bytes(buf[:end])
+                del buf[:end]
+                # \r\n、\n、\r 均视为行尾
+                for raw in complete.splitlines():
+                    line = raw.decode(errors="replace").strip()
+                    if line:
+                        self.on_line(line)
             except SerialException as exc:
                 self.on_line(f"[读错误] {exc}")
                 time.sleep(0.2)
@@ -1,16 +1,26 @@
 from __future__ import annotations
 
+import os
+import queue
 import threading
 import time
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Optional, Tuple, Any
 import json
 
+from camera_backend import open_capture
+
 try:
     import cv2  # pip install opencv-python
 except Exception as exc:  # pragma: no cover
     cv2 = None
 
+try:
+    import orjson  # 可选：更快的 JSON 解析
+except Exception:  # pragma: no cover
+    orjson = None
+
 
 class OpenCVDualRecorder:
     """
@@ -22,6 +32,9 @@ class OpenCVDualRecorder:
     """
 
     FRAME_EXTRACT_INTERVAL = 150  # 每 150 帧抽取一张
+    PREVIEW_STRIDE = 5  # 抽帧模式下每 5 帧解码一帧供预览，其余帧不解码
+    FRAME_QUEUE_SIZE = 8  # 抽帧模式下待写图片的缓冲数
+    HW_FOURCC = "avc1"  # 优先尝试的硬件加速编码（H.264）
 
     def __init__(
         self,
@@ -30,6 +43,10 @@ class OpenCVDualRecorder:
         fourcc_code: str = "mp4v",
         target_fps: float = 30.0,
         target_resolution: Optional[Tuple[int, int]] = None,  # (width, height)
+        buffer_size: Optional[int] = None,  # 驱动帧缓冲数，1 = 只保留最新帧
+        num_buffers: int = 2,  # 采集线程与写入线程之间的帧缓冲数
+        input_fourcc: Optional[str] = None,  # 采集格式，如 "MJPG"
+        jpeg_quality: int = 95,  # 抽帧模式的 JPEG 质量（与 cv2.imwrite 默认一致）
     ) -> None:
         if cv2 is None:
             raise RuntimeError("未安装 opencv-python，请先安装后再使用摄像头录制功能")
@@ -41,25 +58,48 @@ class OpenCVDualRecorder:
         self.fourcc_code = fourcc_code
         self.target_fps = target_fps
         self.target_resolution = target_resolution
+        self.buffer_size = buffer_size
+        self.input_fourcc = input_fourcc
+        self.num_buffers = max(1, int(num_buffers))
+        # FOURCC 整数只在构造时计算一次；写入器依次尝试的编码（去重，保持顺序）
+        self._fourcc_int = cv2.VideoWriter_fourcc(*fourcc_code)
+        self._writer_fourccs = tuple(dict.fromkeys((cv2.VideoWriter_fourcc(*self.HW_FOURCC), self._fourcc_int)))
+        self._input_fourcc_int = cv2.VideoWriter_fourcc(*input_fourcc) if input_fourcc else None
+        # 抽帧模式的 JPEG 编码参数；关闭 Huffman 优化以减少每张图的编码耗时
+        self._jpeg_params = [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality, cv2.IMWRITE_JPEG_OPTIMIZE, 0]
         self._per_cam_params: Dict[int, Dict[str, Any]] = {}
+        self._params_source: Optional[Tuple[str, int]] = None  # 上次加载的参数文件 (路径, mtime)
 
         # 运行时状态
         self._recording_flags: Dict[int, bool] = {}
         self._stop_events: Dict[int, threading.Event] = {}
-        self._threads: Dict[int, threading.Thread] = {}
+        self._writer_threads: Dict[int, threading.Thread] = {}
+        self._grab_threads: Dict[int, threading.Thread] = {}  # 采集线程（_writer_threads 为写入线程）
         self._captures: Dict[int, "cv2.VideoCapture"] = {}
         self._writers: Dict[int, "cv2.VideoWriter"] = {}
         self._output_paths: Dict[int, Path] = {}
         self._record_modes: Dict[int, str] = {}  # 记录每个摄像头的录制模式
-        self._latest_frames: Dict[int, Any] = {}
-        self._latest_frames_lock = threading.Lock()
+        self._frames_written: Dict[int, int] = {}  # 写入线程退出时记录写出的帧/图片数
+        # 采集线程写、预览线程读；单个键的赋值/读取在 GIL 下是原子的，无需加锁
+        self._latest_frames: Dict[int, Any] = {}
+
+        # 每个摄像头一把锁：允许两个摄像头并行启动/停止，同一摄像头的操作串行
+        self._cam_locks: Dict[int, threading.Lock] = {}
 
         for idx in cam_indices:
             self._recording_flags[idx] = False
+            self._cam_locks[idx] = threading.Lock()
 
     # 允许从 JSON 文件加载每个摄像头的参数（索引、分辨率、FPS、ROI等）
     def load_params_from_json(self, json_path: Path) -> None:
-        data = json.loads(Path(json_path).read_text(encoding="utf-8"))
+        path = Path(json_path)
+        # 同一文件未修改时重复加载直接跳过（结果与上次相同）
+        key = (str(path), path.stat().st_mtime_ns)
+        if key == self._params_source:
+            return
+        raw = path.read_bytes()
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw.decode("utf-8"))
+        self._params_source = key
         if isinstance(data, dict) and "camera_index" in data:
             # 单摄配置
             cam_idx = int(data.get("camera_index", 0))
@@ -88,37 +128,57 @@ class OpenCVDualRecorder:
     def is_recording(self, cam_idx: int) -> bool:
         return self._recording_flags.get(cam_idx, False)
 
-    def get_latest_frame(self, cam_idx: int):
-        with self._latest_frames_lock:
-            return self._latest_frames.get(cam_idx)
+    def get_latest_frame(self, cam_idx: int):
+        return self._latest_frames.get(cam_idx)
 
+    def output_name(self, cam_idx: int, filename_stem: str, record_mode: str = "video") -> str:
+        """录制输出在 save_dir 下的名称：视频为 <stem>_<n>.mp4，抽帧模式为文件夹 <stem>_<n>。"""
+        suffix = "" if record_mode == "frames" else ".mp4"
+        return f"{filename_stem}_{self._cam_label(cam_idx)}{suffix}"
+
     def toggle(self, cam_idx: int, filename_stem: str, record_mode: str = "video") -> Tuple[bool, Optional[Path]]:
         """
         切换指定摄像头录制状态。
         record_mode: "video" (录制视频) 或 "frames" (抽帧图片)
         返回: (started, saved_path)
-        - started=True 表示刚开始录制；started=False 表示刚停止，并返回保存路径。
+        - started=True 表示刚开始录制；started=False 表示刚停止，并返回保存路径（未写出任何帧时为 None）。
         """
-        if not self.is_recording(cam_idx):
+        with self._cam_lock(cam_idx):
+            if not self.is_recording(cam_idx):
+                self._start(cam_idx, filename_stem, record_mode)
+                return True, None
+            else:
+                saved = self._stop(cam_idx)
+                return False, saved
+
+    def start(self, cam_idx: int, filename_stem: str, record_mode: str = "video") -> None:
+        """开始录制指定摄像头（已在录制则不做任何事）；打开失败时抛出 RuntimeError。"""
+        with self._cam_lock(cam_idx):
             self._start(cam_idx, filename_stem, record_mode)
-            return True, None
-        else:
-            saved = self._stop(cam_idx)
-            return False, saved
+
+    def stop(self, cam_idx: int) -> Optional[Path]:
+        """停止指定摄像头并释放其资源，不影响另一个摄像头；返回保存路径（未在录制或未写出任何帧时为 None）。"""
+        with self._cam_lock(cam_idx):
+            return self._stop(cam_idx)
 
     # ----------------------- internals ----------------------- #
+    def _cam_lock(self, cam_idx: int) -> threading.Lock:
+        return self._cam_locks.setdefault(cam_idx, threading.Lock())
+
     def _start(self, cam_idx: int, filename_stem: str, record_mode: str = "video") -> None:
         if self.is_recording(cam_idx):
             return
 
-        cap = cv2.VideoCapture(cam_idx, cv2.CAP_DSHOW)
-        if not cap.isOpened():
-            # 尝试不指定后端再打开一次（跨平台兼容）
-            cap.release()
-            cap = cv2.VideoCapture(cam_idx)
+        cap = open_capture(cam_idx)
         if not cap.isOpened():
             raise RuntimeError(f"摄像头 {cam_idx} 打开失败")
 
+        # 采集格式需在分辨率之前设置；缓冲设为 1 帧可避免读到积压的旧帧（不支持时会被忽略）
+        if self._input_fourcc_int is not None:
+            cap.set(cv2.CAP_PROP_FOURCC, self._input_fourcc_int)
+        if self.buffer_size:
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, self.buffer_size)
+
         # 分辨率与 FPS 设置（若不支持会被忽略）
         if self.target_resolution:
             width, height = self.target_resolution
@@ -135,28 +195,53 @@ class OpenCVDualRecorder:
             cap.release()
             raise RuntimeError(f"摄像头 {cam_idx} 无法读取帧")
 
+        # ROI 在会话内固定：按实际帧尺寸解析一次，输出尺寸取裁剪后的大小
+        roi_slices = self._roi_slices(self._per_cam_params.get(cam_idx, {}).get("roi"), frame.shape)
+        if roi_slices is not None:
+            frame = frame[roi_slices]
         height, width = frame.shape[:2]
-        cam_label = self._cam_label(cam_idx)
+        out_path = self.save_dir / self.output_name(cam_idx, filename_stem, record_mode)
+        # 实际 FPS 只查询一次；驱动帧率远高于目标（> 1.5 倍）时按比例跳帧，写入器按保留下来的帧率写
+        fps = self._real_fps(cap)
+        target_fps = self._per_cam_params.get(cam_idx, {}).get("fps") or self.target_fps
+        keep = round(fps / target_fps) if target_fps and fps > target_fps * 1.5 else 1
+        fps /= keep
 
         # 根据录制模式设置输出
         if record_mode == "frames":
             # 抽帧模式：创建文件夹
-            out_path = self.save_dir / f"{filename_stem}_{cam_label}"
             out_path.mkdir(parents=True, exist_ok=True)
             writer = None  # 抽帧模式不需要 VideoWriter
         else:
             # 视频模式：创建 VideoWriter
-            fourcc = cv2.VideoWriter_fourcc(*self.fourcc_code)
-            out_path = self.save_dir / f"{filename_stem}_{cam_label}.mp4"
-            writer = cv2.VideoWriter(str(out_path), fourcc, self._real_fps(cap), (width, height))
+            # 先写到同目录的临时文件，停止时再原子替换为正式文件名：
+            # 录制中途崩溃不会留下半截的同名视频，也不会提前覆盖已有文件
+            writer = self._open_writer(self._part_path(out_path), fps, (width, height))
             if not writer.isOpened():
                 cap.release()
                 raise RuntimeError("VideoWriter 打开失败，可能是编码器不可用或路径无效")
 
+        # 双缓冲：采集线程只负责读帧，写入线程负责编码/保存，写入变慢时不阻塞采集
         stop_event = threading.Event()
-        thread = threading.Thread(
-            target=self._capture_loop,
-            args=(cam_idx, cap, writer, stop_event, record_mode, out_path),
+        # 抽帧模式每张图都要落盘，缓冲放宽到 FRAME_QUEUE_SIZE，磁盘短暂卡顿（SD 卡/网络盘）时不丢图
+        maxsize = max(self.num_buffers, self.FRAME_QUEUE_SIZE) if record_mode == "frames" else self.num_buffers
+        frames: "queue.Queue[Any]" = queue.Queue(maxsize=maxsize)
+        # 抽帧模式只有保存帧和预览帧需要解码，其余帧只 grab() 推进驱动缓冲
+        if record_mode == "frames":
+            every, stride = self.FRAME_EXTRACT_INTERVAL, self.PREVIEW_STRIDE
+        else:
+            every = stride = 1
+        # 每个摄像头一个采集线程：grab() 会阻塞到下一帧，共用线程时慢的或断开的摄像头会拖住另一个
+        grab_thread = threading.Thread(
+            target=self._grab_loop,
+            args=(cam_idx, cap, frames, stop_event, keep, every, stride, roi_slices),
+            name=f"recorder-grab-{cam_idx}",
+            daemon=True,
+        )
+        writer_thread = threading.Thread(
+            target=self._writer_loop,
+            args=(cam_idx, frames, writer, stop_event, record_mode, out_path),
+            name=f"recorder-writer-{cam_idx}",
             daemon=True,
         )
 
@@ -164,11 +249,13 @@ class OpenCVDualRecorder:
         self._writers[cam_idx] = writer
         self._output_paths[cam_idx] = out_path
         self._stop_events[cam_idx] = stop_event
-        self._threads[cam_idx] = thread
+        self._writer_threads[cam_idx] = writer_thread
+        self._grab_threads[cam_idx] = grab_thread
         self._recording_flags[cam_idx] = True
         self._record_modes[cam_idx] = record_mode
 
-        thread.start()
+        writer_thread.start()
+        grab_thread.start()
 
     def _stop(self, cam_idx: int) -> Optional[Path]:
         if not self.is_recording(cam_idx):
@@ -178,9 +265,11 @@ class OpenCVDualRecorder:
         if cam_idx in self._stop_events:
             self._stop_events[cam_idx].set()
 
-        # 等待线程结束
-        if cam_idx in self._threads:
-            self._threads[cam_idx].join(timeout=3.0)
+        # 等待线程结束（先采集、后写入，写入线程会写完缓冲中剩余的帧）
+        if cam_idx in self._grab_threads:
+            self._grab_threads[cam_idx].join(timeout=3.0)
+        if cam_idx in self._writer_threads:
+            self._writer_threads[cam_idx].join(timeout=3.0)
 
         # 释放资源
         if cam_idx in self._writers and self._writers[cam_idx] is not None:
@@ -188,84 +277,165 @@ class OpenCVDualRecorder:
                 self._writers[cam_idx].release()
             except Exception:
                 pass
-        if cam_idx in self._captures:
-            try:
-                self._captures[cam_idx].release()
-            except Exception:
-                pass
+        # 摄像头由采集线程退出时自行释放：线程还卡在 grab() 里时不能在这里释放
 
         saved_path = self._output_paths.get(cam_idx)
+        # 一帧/一张都没写出则视为没有生成文件（写入线程未按时退出时仍返回路径）
+        if self._frames_written.pop(cam_idx, None) == 0:
+            saved_path = None
+        if self._writers.get(cam_idx) is not None:
+            part = self._part_path(self._output_paths[cam_idx])
+            if saved_path is None:
+                try:
+                    os.remove(part)
+                except OSError:
+                    pass
+            else:
+                saved_path = self._finalize_part(part, saved_path)
 
         # 清理状态
-        for d in (self._writers, self._captures, self._threads, self._stop_events, self._output_paths, self._record_modes):
+        for d in (self._writers, self._captures, self._writer_threads, self._grab_threads, self._stop_events, self._output_paths, self._record_modes):
             d.pop(cam_idx, None)
-        with self._latest_frames_lock:
-            self._latest_frames.pop(cam_idx, None)
+        self._latest_frames.pop(cam_idx, None)
 
         return saved_path
 
-    def _capture_loop(
+    def _grab_loop(
         self,
         cam_idx: int,
         cap: "cv2.VideoCapture",
+        frames: "queue.Queue[Any]",
+        stop_event: threading.Event,
+        keep: int,
+        every: int,
+        stride: int,
+        roi_slices: Optional[Tuple[slice, slice]],
+    ) -> None:
+        # grab() 由驱动按帧率阻塞，无需自行控制节奏；只解码要保存或预览的帧
+        n = 0
+        try:
+            while not stop_event.is_set():
+                if not cap.grab():
+                    # 取帧失败（如设备断开）时稍等，避免空转
+                    time.sleep(0.005)
+                    continue
+                i = n
+                n += 1
+                # 驱动帧率远高于目标时每 keep 帧只保留一帧
+                if i % keep:
+                    continue
+                i //= keep
+                if i % stride and i % every:
+                    continue
+                ok, frame = cap.retrieve()
+                if not ok or frame is None:
+                    continue
+
+                if roi_slices is not None:
+                    frame = frame[roi_slices]
+
+                self._latest_frames[cam_idx] = frame
+
+                if i % every == 0:
+                    # 缓冲已满说明写入跟不上：丢弃最旧的一帧，采集不等待
+                    try:
+                        frames.put_nowait(frame)
+                    except queue.Full:
+                        try:
+                            frames.get_nowait()
+                        except queue.Empty:
+                            pass
+                        frames.put_nowait(frame)
+        finally:
+            cap.release()
+
+    @staticmethod
+    def _roi_slices(roi: Any, shape: Tuple[int, ...]) -> Optional[Tuple[slice, slice]]:
+        # ROI 为 (x, y, w, h)，按帧尺寸裁到有效范围；无 ROI 或裁剪后为空时返回 None
+        if not (
+            isinstance(roi, (list, tuple))
+            and len(roi) == 4
+            and isinstance(roi[0], (int, float))
+        ):
+            return None
+        x, y, rw, rh = map(int, roi)
+        h, w = shape[:2]
+        x = max(0, min(x, w - 1))
+        y = max(0, min(y, h - 1))
+        rw = max(0, min(rw, w - x))
+        rh = max(0, min(rh, h - y))
+        if rw > 0 and rh > 0:
+            return slice(y, y + rh), slice(x, x + rw)
+        return None
+
+    def _writer_loop(
+        self,
+        cam_idx: int,
+        frames: "queue.Queue[Any]",
         writer: Optional["cv2.VideoWriter"],
         stop_event: threading.Event,
         record_mode: str,
         out_path: Path,
     ) -> None:
-        # 稍作降速，避免写入过快导致高 CPU（如果相机报告的 FPS 很高）
-        frame_interval = 1.0 / max(self._real_fps(cap), 1.0)
-        next_ts = time.time()
-        frame_count = 0
-        extracted_count = 0
-
-        while not stop_event.is_set():
-            ok, frame = cap.read()
-            if not ok or frame is None:
-                time.sleep(0.005)
+        # 采集线程只把需要保存的帧放进缓冲（抽帧模式下即每 150 帧一张）
+        count = 0
+
+        while True:
+            try:
+                frame = frames.get(timeout=0.1)
+            except queue.Empty:
+                # 停止后写完缓冲中剩余的帧再退出
+                if stop_event.is_set():
+                    break
                 continue
 
-            # 如果有 ROI（x,y,w,h 且 w,h>0）则裁剪
-            params = self._per_cam_params.get(cam_idx, {})
-            roi = params.get("roi")
-            if (
-                isinstance(roi, (list, tuple))
-                and len(roi) == 4
-                and isinstance(roi[0], (int, float))
-            ):
-                x, y, rw, rh = map(int, roi)
-                h, w = frame.shape[:2]
-                x = max(0, min(x, w - 1))
-                y = max(0, min(y, h - 1))
-                rw = max(0, min(rw, w - x))
-                rh = max(0, min(rh, h - y))
-                if rw > 0 and rh > 0:
-                    frame = frame[y : y + rh, x : x + rw]
-
-            with self._latest_frames_lock:
-                self._latest_frames[cam_idx] = frame
-
-            if record_mode == "frames":
-                # 抽帧模式：每 150 帧保存一张图片
-                if frame_count % self.FRAME_EXTRACT_INTERVAL == 0:
-                    img_path = out_path / f"frame_{extracted_count:04d}.jpg"
-                    cv2.imwrite(str(img_path), frame)
-                    extracted_count += 1
-            else:
-                # 视频模式：写入视频
-                if writer is not None:
-                    writer.write(frame)
-
-            frame_count += 1
-
-            # 控制写入频率接近目标 FPS
-            next_ts += frame_interval
-            now = time.time()
-            sleep_s = next_ts - now
-            if sleep_s > 0:
-                time.sleep(sleep_s)
-            else:
-                next_ts = now
+            if record_mode == "frames":
+                # imencode + 普通文件写入：编码参数只构造一次，且路径含中文时也能保存（imwrite 在 Windows 下不支持）
+                ok, buf = cv2.imencode(".jpg", frame, self._jpeg_params)
+                if not ok:
+                    continue
+                with open(out_path / f"frame_{count:04d}.jpg", "wb") as f:
+                    f.write(buf)
+            elif writer is not None:
+                writer.write(frame)
+            count += 1
+
+        self._frames_written[cam_idx] = count
+
+
+    @staticmethod
+    def _finalize_part(part: Path, out_path: Path) -> Path:
+        # 目标文件被占用（Windows 下被播放器打开等）时改存为带时间后缀的文件名；
+        # 仍失败则保留临时文件并返回其路径，录像不能因改名失败而丢失
+        try:
+            os.replace(part, out_path)
+            return out_path
+        except OSError as exc:
+            alt = out_path.with_name(f"{out_path.stem}{time.strftime('_%Y%m%d_%H%M%S')}{out_path.suffix}")
+            print(f"[录制] 无法覆盖 {out_path}: {exc}，改存为 {alt}")
+        try:
+            os.replace(part, alt)
+            return alt
+        except OSError as exc:
+            print(f"[录制] 改名失败: {exc}，录像保留在 {part}")
+            return part
+
+    @staticmethod
+    def _part_path(out_path: Path) -> Path:
+        # 保留原扩展名，VideoWriter 按扩展名选择封装格式：name.mp4 → name.part.mp4
+        return out_path.with_name(f"{out_path.stem}.part{out_path.suffix}")
+
+    def _open_writer(self, out_path: Path, fps: float, size: Tuple[int, int]) -> "cv2.VideoWriter":
+        # 优先尝试硬件加速的 H.264 编码（MSMF / NVENC / VAAPI 等可用时编码基本不占 CPU），
+        # 不可用时依次退回到配置的编码器（硬件加速 → 软件）
+        if hasattr(cv2, "VIDEOWRITER_PROP_HW_ACCELERATION"):  # OpenCV >= 4.5.2
+            hw = [cv2.VIDEOWRITER_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY]
+            for fourcc in self._writer_fourccs:
+                writer = cv2.VideoWriter(str(out_path), cv2.CAP_ANY, fourcc, fps, size, hw)
+                if writer.isOpened():
+                    return writer
+                writer.release()
+        return cv2.VideoWriter(str(out_path), self._fourcc_int, fps, size)
 
     def _real_fps(self, cap: "cv2.VideoCapture") -> float:
         fps = cap.get(cv2.CAP_PROP_FPS)
@@ -275,6 +445,7 @@ class OpenCVDualRecorder:
         return float(fps)
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def _cam_label(cam_idx: int) -> str:
         # 1-based 标签，便于和 UI 上的"摄像头1/2"对应
         return str(cam_idx + 1)
@@ -12,6 +12,9 @@ except Exception:  # pragma: no cover
     serial = None
     SerialException = Exception
 
+# 称重输出中的数值：支持负号与数字之间有空格的情况，如 "-  191.58"（秤只输出 ASCII）
+_NUMBER_RE = re.compile(r"([-+]?)\s*(\d+\.?\d*)", re.ASCII)
+
 
 @dataclass
 class WeightReaderConfig:
@@ -52,6 +55,19 @@ class WeightReader:
             # 延迟打开失败，允许后续重试
             self._ser = None
             raise RuntimeError(f"打开串口失败: {exc}")
+        try:
+            # Linux USB 串口：关闭 16ms 合包延迟（其他平台不支持，忽略）
+            self._ser.set_low_latency_mode(True)
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        if self._ser is not None:
+            try:
+                self._ser.close()
+            except Exception:
+                pass
+            self._ser = None
 
     def read_value(self, request_cmd: Optional[str] = None, timeout_s: float = 3.0) -> str:
         """
@@ -59,8 +75,11 @@ class WeightReader:
         返回首个非空行（去除换行）。
         如果行里包含数字，则可由上层解析为重量数值。
         """
-        end_ts = time.time() + timeout_s
+        end_ts = time.monotonic() + timeout_s
 
+        # 句柄在上次读写错误后已关闭：在此按需重新打开（打开失败抛 RuntimeError）
+        if serial is not None:
+            self._ensure_open()
         if self._ser is None:
             # 未安装 pyserial 或未打开成功，给出模拟数据
             return "SIM:72.35"
@@ -72,22 +91,25 @@ class WeightReader:
                 self._ser.write(raw)
                 self._ser.flush()
 
-            while time.time() < end_ts:
-                line = self._ser.readline().decode(errors="ignore").strip()
-                if not line:
-                    continue
-                return line
+            # 整块读取已到达的字节再找行尾（readline 逐字节调用 read(1)）；空行跳过
+            buf = bytearray()
+            while time.monotonic() < end_ts:
+                buf += self._ser.read(self._ser.in_waiting or 1)
+                while (i := buf.find(b"\n")) >= 0:
+                    line = buf[:i].decode(errors="ignore").strip()
+                    del buf[: i + 1]
+                    if line:
+                        return line
             raise TimeoutError("读取串口数据超时")
         except SerialException as exc:
+            # 丢弃失效句柄，下次 read_value 时重新打开
+            self.close()
             raise RuntimeError(f"串口读写错误: {exc}")
 
     @staticmethod
     def extract_number(text: str) -> Optional[float]:
-        # 支持负号与数字之间有空格的情况，如 "-  191.58"
-        m = re.search(r"([-+]?)\s*(\d+\.?\d*)", text)
+        m = _NUMBER_RE.search(text)
         if m:
-            sign = m.group(1) or ""
-            number = m.group(2)
-            return float(sign + number)
+            return float(m.group(1) + m.group(2))
         return None
 